@@ -0,0 +1,103 @@
+'''
+Module Name: ai_precompute.py
+Purpose: Background analysis of the position while the player is thinking
+Input(s): None
+Output(s): None
+Original Author(s): Team 2
+Maintainer(s):  Jamie King
+                Jacob Kice
+                Gunther Luechtefeld
+                Joseph Hotze
+                Srihari Meyoor
+Outside Source(s):  None
+Updated Date: 10/17/2026
+'''
+import threading
+from csp_solver import frontier_constraints, split_components, solve_component, SearchTimeout
+
+
+class AIPrecompute:
+    """
+    Enumerates the frontier components in a background thread during the
+    player's turn, so the solver finds them in its component cache when the
+    AI replies. The thread works on a snapshot of the constraints and never
+    reads the live board.
+
+    The player's move reports the cells it changed through touch(): a
+    component containing one of them is abandoned (mid-search if need be),
+    since its constraints are no longer current, while the others keep
+    their results. The AI then only enumerates the region the move changed.
+    The caller's thread only snapshots the frontier; the constraints and
+    components are built in the background thread.
+    """
+
+    def __init__(self):
+        self.thread = None
+        self.touched = set()
+        self.version = 0
+        self.cancelled = False
+        self.lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, frontier):
+        """Starts analyzing the given Frontier (stopping any earlier analysis)"""
+        self.stop()
+        self.touched = set()
+        self.version = 0
+        self.cancelled = False
+        self.thread = threading.Thread(target=self._run, args=(frontier.snapshot(),), daemon=True)
+        self.thread.start()
+
+    def touch(self, cells):
+        """Records flat indices the player's move changed"""
+        if not self.running:
+            return
+        with self.lock:
+            self.touched.update(cells)
+            self.version += 1
+
+    def stop(self):
+        """Abandons the analysis and waits for the thread to finish"""
+        if self.thread is not None:
+            self.cancelled = True
+            self.thread.join()
+            self.thread = None
+
+    def _is_touched(self, cells):
+        with self.lock:
+            return not self.touched.isdisjoint(cells)
+
+    def _cancel_check(self):
+        if self.cancelled:
+            raise SearchTimeout()
+
+    def _run(self, frontier):
+        try:
+            components = split_components(frontier_constraints(frontier, self._cancel_check),
+                                          self._cancel_check)
+        except SearchTimeout:
+            return
+        # Small components first: they are the most likely to finish in time
+        components.sort(key=lambda component: len(component[0]))
+        for cells, constraints in components:
+            if self.cancelled:
+                return
+            if self._is_touched(cells):
+                continue
+            seen = [self.version]
+
+            def check():
+                if self.cancelled:
+                    raise SearchTimeout()
+                if self.version != seen[0]:
+                    seen[0] = self.version
+                    if self._is_touched(cells):
+                        raise SearchTimeout()
+
+            try:
+                solve_component(cells, constraints, check)
+            except SearchTimeout:
+                continue
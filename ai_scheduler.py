@@ -0,0 +1,72 @@
+'''
+Module Name: ai_scheduler.py
+Purpose: Non-blocking pacing of AI moves for the game loop
+Input(s): None
+Output(s): None
+Original Author(s): Team 2
+Maintainer(s):  Jamie King
+                Jacob Kice
+                Gunther Luechtefeld
+                Joseph Hotze
+                Srihari Meyoor
+Outside Source(s):  None
+Updated Date: 10/17/2026
+'''
+from constants import AI_SPEEDS, AI_DEFAULT_SPEED
+
+
+class AIScheduler:
+    """
+    Decides when the AI may play its next move, by comparing timestamps
+    (milliseconds, e.g. pygame.time.get_ticks()) instead of sleeping, so the
+    game loop keeps drawing and handling events between moves.
+
+    Each frame the loop calls arm(now) while it is the AI's turn and plays a
+    move when ready(now) is True, then calls played().
+    """
+
+    def __init__(self, speed=AI_DEFAULT_SPEED):
+        self.speed = speed
+        self.paused = False
+        self.next_move_at = None
+
+    @property
+    def delay(self):
+        """Milliseconds between AI moves at the current speed"""
+        return AI_SPEEDS[self.speed]
+
+    @property
+    def turbo(self):
+        """True when moves are played without any delay"""
+        return self.delay == 0
+
+    def arm(self, now):
+        """Starts the countdown to the next move if it is not running yet"""
+        if self.next_move_at is None:
+            self.next_move_at = now + self.delay
+
+    def ready(self, now):
+        """Returns True if a move is due"""
+        return not self.paused and self.next_move_at is not None and now >= self.next_move_at
+
+    def played(self):
+        """Records that a move was played; the next one is armed again later"""
+        self.next_move_at = None
+
+    def cancel(self):
+        """Drops a pending countdown (new game, turn handed back, ...)"""
+        self.next_move_at = None
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+    def cycle_speed(self, now=None):
+        """Switches to the next speed in AI_SPEEDS and restarts the countdown"""
+        speeds = list(AI_SPEEDS)
+        self.speed = speeds[(speeds.index(self.speed) + 1) % len(speeds)]
+        if self.next_move_at is not None and now is not None:
+            self.next_move_at = now + self.delay
+
+    def status(self):
+        """Short label for the UI"""
+        return "AI: paused" if self.paused else f"AI: {self.speed}"
@@ -10,33 +10,153 @@ Maintainer(s):  Jamie King
                 Joseph Hotze
                 Srihari Meyoor
 Outside Source(s):  None
-Updated Date: 10/05/2025
+Updated Date: 10/17/2026
 '''
 
 import random
+from grid import neighbor_table, neighbors, neighbor_counts, cell_coords, flat_values
+from cell_state import CellSet
+from csp_solver import solve_frontier, linear_deductions, SearchTimeout, expired, deadline_check
+from patterns import match_patterns
+
+
+class Frontier:
+    """
+    Incremental index of the frontier: revealed numbered cells that still
+    have hidden neighbors, with every cell's hidden and flagged neighbor
+    counts. The game calls reveal/flag/unflag as cells change, which only
+    touches their neighbors, so the solver never rescans the board.
+    Cells whose counts changed since the solver last looked at them are kept
+    in dirty; a cell that gave no move cannot give one until it changes.
+    """
+
+    __slots__ = ('rows', 'cols', 'table', 'status', 'shown', 'hidden_around',
+                 'flagged_around', 'cells', 'dirty', 'hidden_count')
+
+    HIDDEN = 0
+    REVEALED = 1
+    FLAGGED = 2
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.table = neighbor_table(rows, cols)
+        self.status = bytearray(rows * cols)
+        self.shown = bytearray(rows * cols)
+        self.hidden_around = neighbor_counts(rows, cols)
+        self.flagged_around = bytearray(rows * cols)
+        self.cells = set()
+        self.dirty = set()
+        self.hidden_count = rows * cols
+
+    def reveal(self, i, value):
+        """Cell i was revealed showing value (-1 for a bomb)"""
+        self.status[i] = Frontier.REVEALED
+        self._leave_hidden(i)
+        if value > 0:
+            self.shown[i] = value
+            if self.hidden_around[i]:
+                self.cells.add(i)
+                self.dirty.add(i)
+
+    def flag(self, i):
+        """Hidden cell i was flagged"""
+        self.status[i] = Frontier.FLAGGED
+        self._leave_hidden(i)
+        for j in neighbors(self.table, i):
+            self.flagged_around[j] += 1
+
+    def unflag(self, i):
+        """Flagged cell i is hidden again"""
+        self.status[i] = Frontier.HIDDEN
+        self.hidden_count += 1
+        for j in neighbors(self.table, i):
+            self.flagged_around[j] -= 1
+            self.hidden_around[j] += 1
+            if self.shown[j]:
+                self.cells.add(j)
+                self.dirty.add(j)
+
+    def _leave_hidden(self, i):
+        self.hidden_count -= 1
+        for j in neighbors(self.table, i):
+            self.hidden_around[j] -= 1
+            if self.shown[j]:
+                if self.hidden_around[j]:
+                    self.dirty.add(j)
+                else:
+                    self.cells.discard(j)
+                    self.dirty.discard(j)
+
+    @classmethod
+    def from_board(cls, grid, rows, cols, revealed, flagged):
+        """Builds the index for a board that is already in play"""
+        frontier = cls(rows, cols)
+        values = flat_values(grid)
+        is_revealed = cell_lookup(revealed, rows, cols)
+        is_flagged = cell_lookup(flagged, rows, cols)
+        for i in range(rows * cols):
+            if is_flagged(i) and not is_revealed(i):
+                frontier.flag(i)
+        for i in range(rows * cols):
+            if is_revealed(i):
+                frontier.reveal(i, values[i])
+        return frontier
+
+    def snapshot(self):
+        """
+        Returns a read-only copy for another thread to work on: the per-cell
+        counts are copied as bytes and the frontier cells as a frozenset,
+        all at C speed, so taking it never holds up a frame.
+        """
+        copy = Frontier.__new__(Frontier)
+        copy.rows = self.rows
+        copy.cols = self.cols
+        copy.table = self.table
+        copy.status = bytes(self.status)
+        copy.shown = bytes(self.shown)
+        copy.hidden_around = bytes(self.hidden_around)
+        copy.flagged_around = bytes(self.flagged_around)
+        copy.cells = frozenset(self.cells)
+        copy.dirty = frozenset()
+        copy.hidden_count = self.hidden_count
+        return copy
+
+    def hidden_of(self, i):
+        """Returns the flat indices of the hidden neighbors of cell i"""
+        status = self.status
+        return [j for j in neighbors(self.table, i) if status[j] == Frontier.HIDDEN]
+
+
+def cell_lookup(cells, board_rows, board_cols):
+    """
+    Returns a function telling whether the cell at a flat index is in cells.
+    CellSets are read directly by index, other sets through cached tuples.
+    """
+    if isinstance(cells, CellSet):
+        return cells.data.__getitem__
+    coords = cell_coords(board_rows, board_cols)
+    return lambda i: coords[i] in cells
 
 
 def hidden_neighbors(row, col, revealed, flagged, board_rows, board_cols):
     """Returns the number of neighboring cells that are not revealed or flagged"""
+    is_revealed = cell_lookup(revealed, board_rows, board_cols)
+    is_flagged = cell_lookup(flagged, board_rows, board_cols)
     hidden = 0
-    for i in range(-1, 2):
-        if row + i >= 0 and row + i < board_rows:
-            for j in range(-1, 2):
-                if (col + j >= 0 and col + j < board_cols) and (i != 0 or j != 0):
-                    if ((row + i, col + j) not in revealed) and ((row + i, col + j) not in flagged):
-                        hidden += 1
+    for j in neighbors(neighbor_table(board_rows, board_cols), row * board_cols + col):
+        if not is_revealed(j) and not is_flagged(j):
+            hidden += 1
     return hidden
 
 
 def flagged_neighbors(row, col, flagged, board_rows, board_cols):
     """Returns the number of neighboring cells that are flagged"""
+    is_flagged = cell_lookup(flagged, board_rows, board_cols)
     num_flagged = 0
-    for i in range(-1, 2):
-        if row + i >= 0 and row + i < board_rows:
-            for j in range(-1, 2):
-                if (col + j >= 0 and col + j < board_cols) and (i != 0 or j != 0):
-                    if (row + i, col + j) in flagged:
-                        num_flagged += 1
+    for j in neighbors(neighbor_table(board_rows, board_cols), row * board_cols + col):
+        if is_flagged(j):
+            num_flagged += 1
     return num_flagged
 
 
@@ -45,100 +165,227 @@ def is_hidden(row, col, revealed, flagged):
     return ((row, col) not in revealed) and ((row, col) not in flagged)
 
 
-def try_basic_moves(grid, board_rows, board_cols, revealed, flagged, ai_level):
+def try_basic_moves(grid, board_rows, board_cols, revealed, flagged, ai_level, frontier=None):
     """
     Attempts basic AI moves (medium and hard difficulty).
     Returns (found, move_type, row, col) where move_type is 'reveal' or 'flag'
+    With a Frontier only the cells that changed since the last call are
+    checked, otherwise the whole board is scanned.
     """
     if ai_level not in ['medium', 'hard']:
         return False, None, None, None
     
-    for row in range(board_rows):
-        for col in range(board_cols):
-            if (row, col) in revealed and hidden_neighbors(row, col, revealed, flagged, board_rows, board_cols) != 0:
-                # Check if all remaining hidden neighbors should be revealed
-                if grid[row][col] == flagged_neighbors(row, col, flagged, board_rows, board_cols):
-                    for i in range(-1, 2):
-                        if row + i >= 0 and row + i < board_rows:
-                            for j in range(-1, 2):
-                                if (col + j >= 0 and col + j < board_cols) and (i != 0 or j != 0):
-                                    if is_hidden(row + i, col + j, revealed, flagged):
-                                        return True, 'reveal', row + i, col + j
-                
-                # Check if all remaining hidden neighbors should be flagged
-                elif grid[row][col] == (hidden_neighbors(row, col, revealed, flagged, board_rows, board_cols) + 
-                                       flagged_neighbors(row, col, flagged, board_rows, board_cols)):
-                    for i in range(-1, 2):
-                        if row + i >= 0 and row + i < board_rows:
-                            for j in range(-1, 2):
-                                if (col + j >= 0 and col + j < board_cols) and (i != 0 or j != 0):
-                                    if is_hidden(row + i, col + j, revealed, flagged):
-                                        return True, 'flag', row + i, col + j
+    if frontier is not None:
+        return _basic_move_from_frontier(frontier)
+    
+    table = neighbor_table(board_rows, board_cols)
+    coords = cell_coords(board_rows, board_cols)
+    values = flat_values(grid)
+    is_revealed = cell_lookup(revealed, board_rows, board_cols)
+    is_flagged = cell_lookup(flagged, board_rows, board_cols)
+    
+    for i in range(board_rows * board_cols):
+        if not is_revealed(i):
+            continue
+        hidden = [j for j in neighbors(table, i) if not is_revealed(j) and not is_flagged(j)]
+        if not hidden:
+            continue
+        num_flagged = sum(1 for j in neighbors(table, i) if is_flagged(j))
+        
+        # Check if all remaining hidden neighbors should be revealed
+        if values[i] == num_flagged:
+            row, col = coords[hidden[0]]
+            return True, 'reveal', row, col
+        
+        # Check if all remaining hidden neighbors should be flagged
+        elif values[i] == len(hidden) + num_flagged:
+            row, col = coords[hidden[0]]
+            return True, 'flag', row, col
     
     return False, None, None, None
 
 
-def try_121_pattern(grid, board_rows, board_cols, revealed, flagged):
+def find_certain_moves(grid, board_rows, board_cols, revealed, flagged, ai_level, frontier=None,
+                        mines_left=None, deadline=None):
     """
-    Attempts the 1-2-1 pattern move (hard difficulty only).
-    Returns (found, move_type, row, col)
+    Returns (safe, mines): every cell proven safe or a bomb, as sets of
+    (row, col), so the caller can apply a whole wave of deductions before
+    searching again. Empty for the easy level.
+    The passes run in order until one finds something: the basic rules (over
+    the cells changed since the last search, given a Frontier), then for
+    the hard and expert levels the pattern table and the subset/Gaussian
+    deductions, then for the expert level the exact solver, which also uses
+    mines_left (bombs not flagged yet). Every pass checks the
+    time.perf_counter() deadline as it goes; once it passes, the moves found
+    so far are returned and the remaining passes are skipped.
     """
-    for row in range(board_rows):
-        for col in range(board_cols):
-            if grid[row][col] == 2 and (row, col) in revealed:
-                if row - 1 >= 0 and row + 1 < board_rows and col - 1 >= 0 and col + 1 < board_cols:
-                    # Check for 1-2-1 pattern
-                    has_row_pattern = (grid[row - 1][col] == 1 and grid[row + 1][col] == 1 and 
-                                      (row - 1, col) in revealed and (row + 1, col) in revealed)
-                    has_col_pattern = (grid[row][col - 1] == 1 and grid[row][col + 1] == 1 and
-                                      (row, col - 1) in revealed and (row, col + 1) in revealed)
-                    
-                    if has_row_pattern or has_col_pattern:
-                        corners_hidden = (is_hidden(row - 1, col - 1, revealed, flagged) and
-                                        is_hidden(row + 1, col - 1, revealed, flagged) and
-                                        is_hidden(row - 1, col + 1, revealed, flagged) and
-                                        is_hidden(row + 1, col + 1, revealed, flagged))
-                        
-                        if corners_hidden:
-                            # Reveal safe cells
-                            if has_row_pattern:
-                                if is_hidden(row, col - 1, revealed, flagged):
-                                    return True, 'reveal', row, col - 1
-                                elif is_hidden(row, col + 1, revealed, flagged):
-                                    return True, 'reveal', row, col + 1
-                            elif has_col_pattern:
-                                if is_hidden(row - 1, col, revealed, flagged):
-                                    return True, 'reveal', row - 1, col
-                                elif is_hidden(row + 1, col, revealed, flagged):
-                                    return True, 'reveal', row + 1, col
-                        
-                        # Check for corner patterns (flag opposite corners)
-                        corner_checks = [
-                            ((row - 1, col - 1), [(has_row_pattern, row - 1, col + 1), (has_col_pattern, row + 1, col - 1)]),
-                            ((row + 1, col - 1), [(has_row_pattern, row + 1, col + 1), (has_col_pattern, row - 1, col - 1)]),
-                            ((row - 1, col + 1), [(has_row_pattern, row - 1, col - 1), (has_col_pattern, row + 1, col + 1)]),
-                            ((row + 1, col + 1), [(has_row_pattern, row + 1, col - 1), (has_col_pattern, row - 1, col + 1)])
-                        ]
-                        
-                        for corner, flags in corner_checks:
-                            if corner in revealed:
-                                for pattern, flag_row, flag_col in flags:
-                                    if pattern and is_hidden(flag_row, flag_col, revealed, flagged):
-                                        return True, 'flag', flag_row, flag_col
+    safe, mines = set(), set()
+    if ai_level not in ['medium', 'hard', 'expert']:
+        return safe, mines
     
-    return False, None, None, None
+    check = deadline_check(deadline)
+    try:
+        if frontier is not None:
+            for i in list(frontier.dirty):
+                if check is not None:
+                    check()
+                hidden = frontier.hidden_of(i)
+                num_flagged = frontier.flagged_around[i]
+                number = frontier.shown[i]
+                if hidden and number == num_flagged:
+                    safe.update(hidden)
+                elif hidden and number == len(hidden) + num_flagged:
+                    mines.update(hidden)
+                else:
+                    # Nothing to learn here until its counts change again
+                    frontier.dirty.discard(i)
+        else:
+            table = neighbor_table(board_rows, board_cols)
+            values = flat_values(grid)
+            is_revealed = cell_lookup(revealed, board_rows, board_cols)
+            is_flagged = cell_lookup(flagged, board_rows, board_cols)
+            for i in range(board_rows * board_cols):
+                if check is not None:
+                    check()
+                if not is_revealed(i):
+                    continue
+                hidden = [j for j in neighbors(table, i) if not is_revealed(j) and not is_flagged(j)]
+                if not hidden:
+                    continue
+                num_flagged = sum(1 for j in neighbors(table, i) if is_flagged(j))
+                if values[i] == num_flagged:
+                    safe.update(hidden)
+                elif values[i] == len(hidden) + num_flagged:
+                    mines.update(hidden)
+        
+        if (ai_level in ['hard', 'expert'] and frontier is not None and not safe and not mines
+                and not expired(deadline)):
+            safe, mines = match_patterns(frontier, deadline_check=check)
+        
+        if (ai_level in ['hard', 'expert'] and frontier is not None and not safe and not mines
+                and not expired(deadline)):
+            safe, mines = linear_deductions(frontier, check)
+        
+        if (ai_level == 'expert' and frontier is not None and not safe and not mines
+                and not expired(deadline)):
+            safe, mines, _, _, _ = solve_frontier(frontier, check, mines_left)
+    except SearchTimeout:
+        pass
+    
+    # Wrong flags can make a cell look both safe and a bomb, trust neither
+    conflicts = safe & mines
+    coords = cell_coords(board_rows, board_cols)
+    return ({coords[i] for i in safe - conflicts},
+            {coords[i] for i in mines - conflicts})
 
 
-def make_random_move(board_rows, board_cols, revealed, flagged):
-    """Makes a random move on an unrevealed, unflagged cell"""
-    rand_rows = list(range(board_rows))
-    random.shuffle(rand_rows)
-    rand_cols = list(range(board_cols))
-    random.shuffle(rand_cols)
-    
-    for row in rand_rows:
-        for col in rand_cols:
-            if (row, col) not in flagged and (row, col) not in revealed:
-                return True, row, col
+def _basic_move_from_frontier(frontier):
+    """try_basic_moves over the dirty frontier cells"""
+    while frontier.dirty:
+        i = frontier.dirty.pop()
+        hidden = frontier.hidden_around[i]
+        if not hidden:
+            continue
+        num_flagged = frontier.flagged_around[i]
+        number = frontier.shown[i]
+        
+        if number == num_flagged:
+            move_type = 'reveal'
+        elif number == hidden + num_flagged:
+            move_type = 'flag'
+        else:
+            continue
+        
+        # The cell still has other hidden neighbors to settle next time
+        frontier.dirty.add(i)
+        j = frontier.hidden_of(i)[0]
+        return True, move_type, j // frontier.cols, j % frontier.cols
     
-    return False, None, None
+    return False, None, None, None
+
+
+def try_121_pattern(grid, board_rows, board_cols, revealed, flagged, frontier=None, deadline=None):
+    """
+    Attempts a pattern move (hard and expert difficulty): the 1-2-1 pattern
+    and the other local patterns in patterns.PATTERNS, in every orientation.
+    Without a Frontier one is built from the board first. The search stops
+    at the time.perf_counter() deadline.
+    Returns (found, move_type, row, col)
+    """
+    if frontier is None:
+        frontier = Frontier.from_board(grid, board_rows, board_cols, revealed, flagged)
+    safe, mines = match_patterns(frontier, deadline_check=deadline_check(deadline))
+    if safe:
+        i = min(safe)
+        return True, 'reveal', i // board_cols, i % board_cols
+    if mines:
+        i = min(mines)
+        return True, 'flag', i // board_cols, i % board_cols
+    return False, None, None, None
+
+
+def estimate_risks(frontier, mines_left):
+    """
+    Cheap bomb-risk estimate for guessing: a hidden cell next to the frontier
+    gets the highest (bombs left / hidden neighbors) ratio among its numbered
+    neighbors, any other cell the bomb density of all hidden cells.
+    Returns (risks, interior_risk) with risks keyed by flat index.
+    """
+    risks = {}
+    for i in frontier.cells:
+        hidden = frontier.hidden_of(i)
+        risk = (frontier.shown[i] - frontier.flagged_around[i]) / len(hidden)
+        for j in hidden:
+            if risk > risks.get(j, -1):
+                risks[j] = risk
+    if not frontier.hidden_count:
+        return risks, 1.0
+    return risks, min(1.0, max(0, mines_left) / frontier.hidden_count)
+
+
+def try_least_risky_guess(frontier, mines_left):
+    """
+    Reveals the frontier cell with the lowest estimated risk if it is safer
+    than a cell away from the frontier (or there is no such cell).
+    Returns (found, move_type, row, col)
+    """
+    risks, interior_risk = estimate_risks(frontier, mines_left)
+    if not risks:
+        return False, None, None, None
+    i = min(risks, key=lambda j: (risks[j], j))
+    if risks[i] >= interior_risk and len(risks) < frontier.hidden_count:
+        return False, None, None, None
+    return True, 'reveal', i // frontier.cols, i % frontier.cols
+
+
+def _next_to_frontier(frontier, i):
+    """Returns True if hidden cell i touches a revealed number"""
+    status, shown = frontier.status, frontier.shown
+    return any(status[j] == Frontier.REVEALED and shown[j] for j in neighbors(frontier.table, i))
+
+
+def make_random_move(board_rows, board_cols, revealed, flagged, rng=random, pool=None, frontier=None):
+    """
+    Makes a uniformly random move on an unrevealed, unflagged cell.
+    With the game's CellPool of hidden cells the pick is O(1); with a
+    Frontier as well, it keeps drawing (at most once per hidden cell) until
+    it finds a cell away from the numbers, since the caller only guesses
+    blind when those are safer.
+    """
+    if pool is not None:
+        if not pool:
+            return False, None, None
+        i = pool.sample(rng)
+        if frontier is not None:
+            for _ in range(len(pool)):
+                if not _next_to_frontier(frontier, i):
+                    break
+                i = pool.sample(rng)
+        return True, i // board_cols, i % board_cols
+
+    hidden = [(row, col) for row in range(board_rows) for col in range(board_cols)
+              if (row, col) not in flagged and (row, col) not in revealed]
+    if not hidden:
+        return False, None, None
+    row, col = rng.choice(hidden)
+    return True, row, col
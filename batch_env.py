@@ -0,0 +1,135 @@
+'''
+Module Name: batch_env.py
+Purpose: Batched Minesweeper environment running many boards in lockstep
+Input(s): None
+Output(s): None
+Original Author(s): Team 2
+Maintainer(s):  Jamie King
+                Jacob Kice
+                Gunther Luechtefeld
+                Joseph Hotze
+                Srihari Meyoor
+Outside Source(s):  None
+Updated Date: 10/17/2026
+'''
+import random
+from constants import OBS_HIDDEN, OBS_FLAGGED
+from grid import np, generate_bombs, count_adjacent_bombs
+
+# Action codes for BatchEnv.step
+REVEAL = 0
+FLAG = 1
+
+
+class BatchEnv:
+    """
+    N games of the same shape held in stacked (N, rows, cols) arrays.
+    step() applies one action per board with vectorized reveal/flag updates
+    and resets finished boards automatically. As in GameState, bombs are
+    placed on each board's first reveal, away from the clicked cell.
+    Requires numpy.
+    """
+
+    def __init__(self, num_boards, rows, cols, mines, seed=None):
+        if np is None:
+            raise ImportError("BatchEnv requires numpy")
+        self.num_boards = num_boards
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        self.rng = random.Random(seed)
+        shape = (num_boards, rows, cols)
+        self.cells = np.zeros(shape, dtype=np.int8)
+        self.revealed = np.zeros(shape, dtype=bool)
+        self.flagged = np.zeros(shape, dtype=bool)
+        self.started = np.zeros(num_boards, dtype=bool)
+        self.bomb_counts = np.zeros(num_boards, dtype=np.int64)
+
+    def reset(self, boards=None):
+        """Clears the given boards (all by default) and returns the observation"""
+        if boards is None:
+            boards = np.arange(self.num_boards)
+        self.cells[boards] = 0
+        self.revealed[boards] = False
+        self.flagged[boards] = False
+        self.started[boards] = False
+        self.bomb_counts[boards] = 0
+        return self.observation()
+
+    def observation(self):
+        """Visible boards: numbers on revealed cells, OBS_FLAGGED/OBS_HIDDEN elsewhere"""
+        return np.where(self.revealed, self.cells,
+                        np.where(self.flagged, OBS_FLAGGED, OBS_HIDDEN)).astype(np.int8)
+
+    def _start(self, boards, rows, cols):
+        """Places bombs on unstarted boards, keeping the 3x3 around the first click clear"""
+        for b, row, col in zip(boards.tolist(), rows.tolist(), cols.tolist()):
+            protected = {(row + dr, col + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                         if 0 <= row + dr < self.rows and 0 <= col + dc < self.cols}
+            if self.rows * self.cols - len(protected) < self.mines:
+                protected = {(row, col)}
+            bombs = generate_bombs(self.rows, self.cols, self.mines, exclude=protected, rng=self.rng)
+            if bombs:
+                bomb_rows, bomb_cols = zip(*bombs)
+                self.cells[b, list(bomb_rows), list(bomb_cols)] = -1
+            self.bomb_counts[b] = len(bombs)
+        bomb_mask = self.cells[boards] == -1
+        self.cells[boards] = np.where(bomb_mask, -1, count_adjacent_bombs(bomb_mask))
+        self.started[boards] = True
+
+    def step(self, actions, rows, cols):
+        """
+        Applies actions[i] (REVEAL or FLAG) at (rows[i], cols[i]) on board i.
+        Returns (observation, done, won) where done/won are per-board arrays
+        for this step; finished boards are already reset in the observation.
+        """
+        actions = np.asarray(actions)
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        boards = np.arange(self.num_boards)
+        target_revealed = self.revealed[boards, rows, cols]
+        target_flagged = self.flagged[boards, rows, cols]
+
+        # Flags toggle on hidden cells
+        flag = (actions == FLAG) & ~target_revealed
+        self.flagged[boards[flag], rows[flag], cols[flag]] ^= True
+
+        # Reveals on hidden, unflagged cells
+        reveal = (actions == REVEAL) & ~target_revealed & ~target_flagged
+        first = reveal & ~self.started
+        if first.any():
+            self._start(boards[first], rows[first], cols[first])
+
+        hit = np.zeros(self.num_boards, dtype=bool)
+        hit[reveal] = self.cells[boards[reveal], rows[reveal], cols[reveal]] == -1
+        self.revealed[boards[hit], rows[hit], cols[hit]] = True
+
+        opened = reveal & ~hit
+        if opened.any():
+            self._flood(boards[opened], rows[opened], cols[opened])
+
+        done = hit.copy()
+        won = self.revealed.sum(axis=(1, 2)) == self.rows * self.cols - self.bomb_counts
+        won &= self.started & ~hit
+        done |= won
+
+        if done.any():
+            self.reset(boards[done])
+        return self.observation(), done, won
+
+    def _flood(self, boards, rows, cols):
+        """Reveals the clicked cells and grows them through zero cells on all boards at once"""
+        cells = self.cells[boards]
+        zeros = cells == 0
+        safe = cells != -1
+        opened = np.zeros(cells.shape, dtype=bool)
+        opened[np.arange(len(boards)), rows, cols] = True
+        while True:
+            # Every neighbor of an opened zero is safe and opens too
+            grown = opened | (safe & (count_adjacent_bombs(opened & zeros) > 0))
+            if np.array_equal(grown, opened):
+                break
+            opened = grown
+        self.revealed[boards] |= opened
+        # Wrong flags inside an opened region are cleared
+        self.flagged[boards] &= ~opened
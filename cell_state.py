@@ -0,0 +1,155 @@
+'''
+Module Name: cell_state.py
+Purpose: Packed per-cell state (revealed/flagged) for Minesweeper
+Input(s): None
+Output(s): None
+Original Author(s): Team 2
+Maintainer(s):  Jamie King
+                Jacob Kice
+                Gunther Luechtefeld
+                Joseph Hotze
+                Srihari Meyoor
+Outside Source(s):  None
+Updated Date: 10/17/2026
+'''
+from array import array
+from grid import ArrayBoard
+
+
+class CellSet:
+    """
+    Set of (row, col) cells stored as one byte per cell, indexed by
+    row * cols + col. Supports the set operations the game uses (in, add,
+    remove, discard, update, len, iteration), so it can replace a set of
+    tuples. buffer can be any writable one-byte-per-cell buffer, such as the
+    revealed/flagged masks of an ArrayBoard, to share its memory.
+    """
+
+    __slots__ = ('rows', 'cols', 'data', 'count')
+
+    def __init__(self, rows, cols, buffer=None):
+        self.rows = rows
+        self.cols = cols
+        if buffer is None:
+            self.data = bytearray(rows * cols)
+            self.count = 0
+        else:
+            self.data = memoryview(buffer).cast('B')
+            self.count = sum(1 for value in self.data if value)
+
+    def __contains__(self, cell):
+        row, col = cell
+        return 0 <= row < self.rows and 0 <= col < self.cols and self.data[row * self.cols + col] != 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        cols = self.cols
+        for i, value in enumerate(self.data):
+            if value:
+                yield (i // cols, i % cols)
+
+    def contains_index(self, i):
+        """Membership test by flat index"""
+        return self.data[i] != 0
+
+    def add(self, cell):
+        self.add_index(cell[0] * self.cols + cell[1])
+
+    def add_index(self, i):
+        """Adds a cell by flat index"""
+        if not self.data[i]:
+            self.data[i] = 1
+            self.count += 1
+
+    def remove(self, cell):
+        if cell not in self:
+            raise KeyError(cell)
+        self.discard(cell)
+
+    def discard(self, cell):
+        self.discard_index(cell[0] * self.cols + cell[1])
+
+    def discard_index(self, i):
+        """Removes a cell by flat index if present"""
+        if self.data[i]:
+            self.data[i] = 0
+            self.count -= 1
+
+    def update(self, cells):
+        for cell in cells:
+            self.add(cell)
+
+    def clear(self):
+        self.data[:] = bytes(self.rows * self.cols)
+        self.count = 0
+
+    def copy(self):
+        """Returns an independent CellSet with the same cells"""
+        other = CellSet(self.rows, self.cols)
+        other.data[:] = self.data
+        other.count = self.count
+        return other
+
+
+class CellPool:
+    """
+    Pool of flat cell indices with O(1) add, discard and uniform random
+    sampling. The cells fill the first count slots of a preallocated int
+    array and position[i] is cell i's slot (-1 when absent), so a removal
+    moves the last cell into the hole. Starts with every cell of a board of
+    the given size.
+    """
+
+    __slots__ = ('cells', 'count', 'position')
+
+    def __init__(self, size):
+        self.cells = array('i', range(size))
+        self.count = size
+        # Every cell starts in its own slot, so the positions are a C-speed copy
+        self.position = self.cells[:]
+
+    def __contains__(self, i):
+        return self.position[i] >= 0
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(self.cells[:self.count])
+
+    def add(self, i):
+        if self.position[i] < 0:
+            self.cells[self.count] = i
+            self.position[i] = self.count
+            self.count += 1
+
+    def discard(self, i):
+        """Removes cell i if present"""
+        index = self.position[i]
+        if index < 0:
+            return
+        self.count -= 1
+        last = self.cells[self.count]
+        self.cells[index] = last
+        self.position[last] = index
+        self.position[i] = -1
+
+    def sample(self, rng):
+        """Returns a uniformly random cell of the pool (which must not be empty)"""
+        return self.cells[int(rng.random() * self.count)]
+
+
+def new_cell_sets(grid):
+    """
+    Returns empty (revealed, flagged) CellSets for the given board.
+    An ArrayBoard shares its revealed/flagged masks with the sets.
+    """
+    rows, cols = len(grid), len(grid[0])
+    if isinstance(grid, ArrayBoard):
+        grid.revealed_mask[:] = False
+        grid.flagged_mask[:] = False
+        return (CellSet(rows, cols, grid.revealed_mask.reshape(-1)),
+                CellSet(rows, cols, grid.flagged_mask.reshape(-1)))
+    return CellSet(rows, cols), CellSet(rows, cols)
@@ -10,7 +10,7 @@ Maintainer(s):  Jamie King
                 Joseph Hotze
                 Srihari Meyoor
 Outside Source(s):  None
-Updated Date: 10/05/2025
+Updated Date: 10/17/2026
 '''
 
 # Display settings
@@ -18,6 +18,57 @@ BOARD_WIDTH = 500
 BOARD_HEIGHT = 600
 UI_HEIGHT = 100
 
+# AI pacing: milliseconds between AI moves for each speed ('S' cycles them)
+AI_SPEEDS = {
+    'demo': 1000,
+    'normal': 500,
+    'fast': 100,
+    'turbo': 0,
+}
+AI_DEFAULT_SPEED = 'demo'
+
+# In turbo mode the AI keeps playing within a frame for at most this many ms
+AI_TURBO_FRAME_BUDGET = 10
+
+# In the game the AI thinks at most this many ms per move, then plays the
+# best move it has found so far
+AI_THINK_BUDGET = 50
+
+# Expert AI: largest frontier component enumerated exactly, and how many
+# solved components are memoized between moves
+CSP_MAX_COMPONENT_CELLS = 40
+CSP_CACHE_SIZE = 512
+
+# Larger components are estimated by sampling: samples per estimate, and
+# worker processes they are spread over (1 samples in the calling process)
+MC_SAMPLES = 2000
+MC_WORKERS = 4
+# With a deadline the samples are drawn in chunks of this size, so the
+# finished ones can be used when time runs out
+MC_CHUNK = 100
+# With a deadline the workers stop this share of the remaining time early,
+# so the samples they drew are back before it
+MC_RETURN_MARGIN = 0.2
+
+# Boards with at least this many cells use the numpy-backed ArrayBoard
+ARRAY_BOARD_MIN_CELLS = 10000
+
+# Board view: cell size limits (px), zoom factor per wheel notch or +/-
+# key press, and how far an arrow key pans (px)
+MIN_CELL_SIZE = 8
+MAX_CELL_SIZE = 64
+ZOOM_FACTOR = 1.25
+PAN_STEP = 50
+
+# With numpy, a move that changes more than this many cells (a large flood
+# fill) redraws the whole view from the tile atlas instead of cell by cell
+BULK_REDRAW_MIN_CELLS = 256
+
+# Frame rate cap of the game and settings screens, and the longest the
+# loops sleep waiting for input when nothing is animating (ms)
+FPS_CAP = 60
+IDLE_WAIT_MAX = 1000
+
 # Color definitions
 COLOR_WHITE = (255, 255, 255)
 COLOR_BLACK = (0, 0, 0)
@@ -42,6 +93,10 @@ NUMBER_COLORS = {
     8: (128, 128, 128),
 }
 
+# Observation codes for cells the player cannot see (see engine.py)
+OBS_HIDDEN = -2
+OBS_FLAGGED = -3
+
 # Direction offsets for neighbor checking
 DIRECTIONS = [
     (-1, -1), (-1, 0), (-1, 1),
@@ -0,0 +1,526 @@
+'''
+Module Name: csp_solver.py
+Purpose: Exact constraint-satisfaction solver for the Minesweeper AI
+Input(s): None
+Output(s): None
+Original Author(s): Team 2
+Maintainer(s):  Jamie King
+                Jacob Kice
+                Gunther Luechtefeld
+                Joseph Hotze
+                Srihari Meyoor
+Outside Source(s):  None
+Updated Date: 10/17/2026
+'''
+import threading
+import time
+from collections import OrderedDict
+from math import exp, gcd, lgamma
+from constants import CSP_MAX_COMPONENT_CELLS, CSP_CACHE_SIZE
+
+# Solved components keyed by their constraints, so components the last move
+# did not touch are not enumerated again. The lock lets the AI fill it from
+# a background thread (see ai_precompute.py).
+_component_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+class SearchTimeout(Exception):
+    """Raised by a deadline check when the solver's time is up"""
+
+
+def expired(deadline):
+    """Returns True if the time.perf_counter() deadline (None: no deadline) has passed"""
+    return deadline is not None and time.perf_counter() >= deadline
+
+
+def deadline_check(deadline):
+    """
+    Returns a function for the solvers' deadline_check parameter that raises
+    SearchTimeout once the deadline has passed. It reads the clock on every
+    call (that costs about as much as counting calls would), so the solvers
+    only need to call it inside their heavy loops. None for no deadline.
+    """
+    if deadline is None:
+        return None
+
+    def check():
+        if time.perf_counter() >= deadline:
+            raise SearchTimeout()
+    return check
+
+
+class ComponentSolution:
+    """
+    All mine assignments of one independent frontier component.
+    by_mines maps a mine count k to (solutions, mine_counts): the number of
+    assignments with k mines and, per cell, how many of them put a mine there.
+    by_mines is None when the component was too large to enumerate.
+    """
+
+    __slots__ = ('cells', 'by_mines')
+
+    def __init__(self, cells, by_mines):
+        self.cells = cells
+        self.by_mines = by_mines
+
+    def probabilities(self):
+        """Returns {cell: mine probability}, every solution weighted equally"""
+        total = sum(count for count, _ in self.by_mines.values())
+        mine_counts = [0] * len(self.cells)
+        for _, counts in self.by_mines.values():
+            for k, count in enumerate(counts):
+                mine_counts[k] += count
+        return {cell: mine_counts[k] / total for k, cell in enumerate(self.cells)}
+
+
+def frontier_constraints(frontier, deadline_check=None):
+    """
+    Turns the frontier into constraints (cells, mines): exactly `mines` of the
+    hidden flat indices in `cells` are bombs. Constraints that flags made
+    impossible are skipped, duplicates are merged.
+    deadline_check works as in solve_component.
+    """
+    constraints = {}
+    for i in frontier.cells:
+        if deadline_check is not None:
+            deadline_check()
+        cells = tuple(frontier.hidden_of(i))
+        mines = frontier.shown[i] - frontier.flagged_around[i]
+        if cells and 0 <= mines <= len(cells):
+            constraints[cells] = mines
+    return list(constraints.items())
+
+
+def split_components(constraints, deadline_check=None):
+    """
+    Splits constraints into independent groups that share no cells.
+    Returns a list of (cells, constraints) with cells in an order where
+    neighboring constraints are visited together.
+    deadline_check works as in solve_component.
+    """
+    parent = {}
+
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    for cells, _ in constraints:
+        if deadline_check is not None:
+            deadline_check()
+        for cell in cells:
+            parent.setdefault(cell, cell)
+        root = find(cells[0])
+        for cell in cells[1:]:
+            other = find(cell)
+            if other != root:
+                parent[other] = root
+
+    groups = {}
+    for constraint in constraints:
+        if deadline_check is not None:
+            deadline_check()
+        groups.setdefault(find(constraint[0][0]), []).append(constraint)
+
+    components = []
+    for group in groups.values():
+        if deadline_check is not None:
+            deadline_check()
+        order = []
+        seen = set()
+        for cells, _ in group:
+            for cell in cells:
+                if cell not in seen:
+                    seen.add(cell)
+                    order.append(cell)
+        components.append((order, group))
+    return components
+
+
+def subset_deductions(constraints, deadline_check=None):
+    """
+    Pairwise reasoning over overlapping constraints.
+    For constraints A and B, B's cells outside A hold at least
+    B.mines - A.mines bombs; when that equals their number they are all
+    bombs and A's cells outside B are all safe (the 1-2-1 family of patterns).
+    When A is inside B with the same count, B's other cells are safe.
+    deadline_check works as in solve_component; when it raises, the
+    deductions found so far are returned.
+    Returns (safe, mines) as sets of flat indices.
+    """
+    safe, mines = set(), set()
+    try:
+        cell_sets = []
+        by_cell = {}
+        for c, (constraint_cells, _) in enumerate(constraints):
+            if deadline_check is not None:
+                deadline_check()
+            cell_sets.append(frozenset(constraint_cells))
+            for cell in constraint_cells:
+                by_cell.setdefault(cell, []).append(c)
+
+        for a, (cells_a, mines_a) in enumerate(constraints):
+            if deadline_check is not None:
+                deadline_check()
+            set_a = cell_sets[a]
+            for b in {b for cell in cells_a for b in by_cell[cell]}:
+                if b == a:
+                    continue
+                only_b = cell_sets[b] - set_a
+                if not only_b:
+                    continue
+                only_a = set_a - cell_sets[b]
+                mines_b = constraints[b][1]
+                if mines_b - mines_a == len(only_b):
+                    mines |= only_b
+                    safe |= only_a
+                elif not only_a and mines_a == mines_b:
+                    safe |= only_b
+    except SearchTimeout:
+        pass
+    return safe, mines
+
+
+def _eliminate(row, pivot_row, column):
+    """Returns row with column cancelled using pivot_row (integer rows, last key 'rhs')"""
+    a = pivot_row[column]
+    b = row[column]
+    result = {}
+    for key in row.keys() | pivot_row.keys():
+        value = a * row.get(key, 0) - b * pivot_row.get(key, 0)
+        if value:
+            result[key] = value
+    divisor = 0
+    for value in result.values():
+        divisor = gcd(divisor, value)
+    if divisor > 1:
+        result = {key: value // divisor for key, value in result.items()}
+    return result
+
+
+def gaussian_deductions(constraints, deadline_check=None):
+    """
+    Gaussian elimination over the 0/1 constraint matrix with sparse integer
+    rows ({cell: coefficient, 'rhs': mines}), one component at a time.
+    A reduced row whose right-hand side equals the sum of its positive
+    coefficients (or minus the sum of its negative ones) forces every cell
+    in it to 0 or 1. deadline_check works as in solve_component; when it
+    raises, the deductions read off so far are returned.
+    Returns (safe, mines) as sets of flat indices.
+    """
+    safe, mines = set(), set()
+    try:
+        for cells, component in split_components(constraints, deadline_check):
+            for row in _reduced_rows(cells, component, deadline_check):
+                if deadline_check is not None:
+                    deadline_check()
+                rhs = row.get('rhs', 0)
+                positive = sum(value for key, value in row.items() if key != 'rhs' and value > 0)
+                negative = sum(value for key, value in row.items() if key != 'rhs' and value < 0)
+                if rhs == positive or rhs == negative:
+                    for key, value in row.items():
+                        if key == 'rhs':
+                            continue
+                        # rhs == positive: positive cells are bombs, negative ones safe
+                        if (value > 0) == (rhs == positive):
+                            mines.add(key)
+                        else:
+                            safe.add(key)
+    except SearchTimeout:
+        pass
+    return safe, mines
+
+
+def _reduced_rows(cells, component, deadline_check=None):
+    """Returns the rows of one component after elimination, column by column in cells order"""
+    rows = []
+    for constraint_cells, count in component:
+        if deadline_check is not None:
+            deadline_check()
+        row = {cell: 1 for cell in constraint_cells}
+        if count:
+            row['rhs'] = count
+        rows.append(row)
+
+    pivot = 0
+    for column in cells:
+        if deadline_check is not None:
+            deadline_check()
+        for r in range(pivot, len(rows)):
+            if column in rows[r]:
+                rows[pivot], rows[r] = rows[r], rows[pivot]
+                break
+        else:
+            continue
+        for r in range(len(rows)):
+            # Large components have many rows to scan even when few change
+            if deadline_check is not None and not r & 1023:
+                deadline_check()
+            if r != pivot and column in rows[r]:
+                if deadline_check is not None:
+                    deadline_check()
+                rows[r] = _eliminate(rows[r], rows[pivot], column)
+        pivot += 1
+        if pivot == len(rows):
+            break
+    return rows
+
+
+def linear_deductions(frontier, deadline_check=None):
+    """
+    Polynomial-time deductions between the basic rules and full enumeration:
+    subset reasoning, then Gaussian elimination if that finds nothing.
+    When deadline_check raises, the deductions found so far are returned.
+    Returns (safe, mines) as sets of flat indices.
+    """
+    try:
+        constraints = frontier_constraints(frontier, deadline_check)
+    except SearchTimeout:
+        return set(), set()
+    safe, mines = subset_deductions(constraints, deadline_check)
+    if not safe and not mines:
+        safe, mines = gaussian_deductions(constraints, deadline_check)
+    return safe, mines
+
+
+def solve_component(cells, constraints, deadline_check=None):
+    """
+    Enumerates every mine assignment of one component by backtracking,
+    checking after each cell that no constraint needs more mines than it has
+    cells left or has too many. Results are memoized by constraint set.
+    Components above CSP_MAX_COMPONENT_CELLS are not enumerated.
+    deadline_check, if given, is called at every search node and may raise
+    to abandon the search.
+    """
+    key = tuple(sorted(constraints))
+    with _cache_lock:
+        cached = _component_cache.get(key)
+        if cached is not None:
+            _component_cache.move_to_end(key)
+    if cached is not None:
+        # The same constraints always mean the same set of cells
+        return ComponentSolution(cached.cells, cached.by_mines)
+
+    if len(cells) > CSP_MAX_COMPONENT_CELLS:
+        return ComponentSolution(cells, None)
+
+    n = len(cells)
+    position = {cell: k for k, cell in enumerate(cells)}
+    touching = [[] for _ in range(n)]
+    need = []
+    left = []
+    for c, (constraint_cells, mines) in enumerate(constraints):
+        need.append(mines)
+        left.append(len(constraint_cells))
+        for cell in constraint_cells:
+            touching[position[cell]].append(c)
+
+    assignment = [0] * n
+    by_mines = {}
+
+    def search(k, mines):
+        if deadline_check is not None:
+            deadline_check()
+        if k == n:
+            entry = by_mines.get(mines)
+            if entry is None:
+                entry = by_mines[mines] = [0, [0] * n]
+            entry[0] += 1
+            counts = entry[1]
+            for m in range(n):
+                if assignment[m]:
+                    counts[m] += 1
+            return
+        for value in (0, 1):
+            ok = True
+            for c in touching[k]:
+                left[c] -= 1
+                need[c] -= value
+                if need[c] < 0 or need[c] > left[c]:
+                    ok = False
+            if ok:
+                assignment[k] = value
+                search(k + 1, mines + value)
+                assignment[k] = 0
+            for c in touching[k]:
+                left[c] += 1
+                need[c] += value
+
+    search(0, 0)
+    solution = ComponentSolution(cells, {k: (count, counts) for k, (count, counts) in by_mines.items()})
+    with _cache_lock:
+        _component_cache[key] = solution
+        if len(_component_cache) > CSP_CACHE_SIZE:
+            _component_cache.popitem(last=False)
+    return solution
+
+
+def _convolve(left, right):
+    """Mine-count distributions are lists indexed by mines; returns their sum's distribution"""
+    result = [0] * (len(left) + len(right) - 1)
+    for i, a in enumerate(left):
+        if a:
+            for j, b in enumerate(right):
+                result[i + j] += a * b
+    return result
+
+
+def _normalized(dist):
+    """Returns dist scaled so its largest entry is 1 (weights only matter relative to each other)"""
+    top = max(dist)
+    return [value / top for value in dist] if top else dist
+
+
+def _interior_weights(frontier_mines, mines_left, interior):
+    """
+    Returns w with w[t] proportional to comb(interior, mines_left - t), the
+    ways the interior cells can hold the bombs a frontier with t mines
+    leaves, for the t with frontier_mines[t] > 0 (0 where none fit).
+    Computed in log space, relative to the largest, so no huge binomial
+    is ever formed.
+    """
+    logs = {}
+    for t, count in enumerate(frontier_mines):
+        rest = mines_left - t
+        if count and 0 <= rest <= interior:
+            logs[t] = lgamma(interior + 1) - lgamma(rest + 1) - lgamma(interior - rest + 1)
+    top = max(logs.values(), default=0.0)
+    return [exp(logs[t] - top) if t in logs else 0.0 for t in range(len(frontier_mines))]
+
+
+def combine_components(solutions, mines_left, interior, deadline_check=None):
+    """
+    Combines component solutions with the global mine count.
+    A configuration with t mines on the frontier leaves mines_left - t bombs
+    for the interior cells (hidden cells next to no number), which can hold
+    them in comb(interior, mines_left - t) ways, so that is its weight.
+    Only the ratios of the weights matter, so they are taken relative to
+    the largest one, once per t, and the distributions are kept scaled to
+    a largest entry of 1.
+    Prefix and suffix products of the per-component distributions give, for
+    each component, the distribution of all the others, which keeps the work
+    linear in the number of components instead of a cross-product.
+    deadline_check works as in solve_component.
+    Returns (probabilities, interior_probability), with exact 0 and 1 where
+    no configuration with the other outcome has any weight, or None if no
+    configuration fits the mine count.
+    """
+    dists = []
+    for solution in solutions:
+        dist = [0] * (max(solution.by_mines) + 1)
+        for k, (count, _) in solution.by_mines.items():
+            dist[k] = count
+        dists.append(dist)
+
+    prefix = [[1]]
+    for dist in dists:
+        if deadline_check is not None:
+            deadline_check()
+        prefix.append(_normalized(_convolve(prefix[-1], dist)))
+    suffix = [[1]]
+    for dist in reversed(dists):
+        if deadline_check is not None:
+            deadline_check()
+        suffix.append(_normalized(_convolve(suffix[-1], dist)))
+    suffix.reverse()
+
+    weights = _interior_weights(prefix[-1], mines_left, interior)
+    total = 0.0
+    interior_mines = 0.0
+    interior_free = 0.0
+    for t, count in enumerate(prefix[-1]):
+        if deadline_check is not None:
+            deadline_check()
+        if weights[t]:
+            rest = mines_left - t
+            total += count * weights[t]
+            interior_mines += count * weights[t] * rest
+            interior_free += count * weights[t] * (interior - rest)
+    if total == 0:
+        return None
+
+    probabilities = {}
+    for c, solution in enumerate(solutions):
+        if deadline_check is not None:
+            deadline_check()
+        others = _convolve(prefix[c], suffix[c + 1])
+        component_total = 0.0
+        mine_weights = [0.0] * len(solution.cells)
+        free_weights = [0.0] * len(solution.cells)
+        for k, (count, counts) in solution.by_mines.items():
+            if deadline_check is not None:
+                deadline_check()
+            weight = sum(other * weights[k + m] for m, other in enumerate(others) if other)
+            if weight:
+                component_total += count * weight
+                for m, mine_count in enumerate(counts):
+                    mine_weights[m] += mine_count * weight
+                    free_weights[m] += (count - mine_count) * weight
+        if component_total == 0:
+            return None
+        for m, cell in enumerate(solution.cells):
+            # Exact 0 and 1 stay exact, so forced moves can be read off
+            probabilities[cell] = 0 if mine_weights[m] == 0 else (
+                1 if free_weights[m] == 0 else mine_weights[m] / component_total)
+
+    interior_probability = None
+    if interior:
+        interior_probability = 0 if interior_mines == 0 else (
+            1 if interior_free == 0 else interior_mines / (total * interior))
+    return probabilities, interior_probability
+
+
+def solve_frontier(frontier, deadline_check=None, mines_left=None):
+    """
+    Solves every frontier component exactly.
+    Returns (safe, mines, probabilities, interior_probability, solutions):
+    flat indices that are safe or bombs in every solution, {flat index: mine
+    probability} for the enumerated cells, the mine probability of a hidden
+    cell away from the frontier (None if unknown), and the ComponentSolutions.
+    With mines_left (bombs not flagged yet) and every component enumerated,
+    the probabilities are global ones from combine_components, and the
+    interior cells are reported safe or bombs when the count forces it.
+    When deadline_check raises, the moves certain within the components
+    solved so far are returned (with no interior probability); the
+    SearchTimeout is passed on if there are none.
+    """
+    probabilities = {}
+    solutions = []
+    interior_probability = None
+    try:
+        components = split_components(frontier_constraints(frontier, deadline_check), deadline_check)
+        for cells, constraints in components:
+            if deadline_check is not None:
+                deadline_check()
+            solution = solve_component(cells, constraints, deadline_check)
+            solutions.append(solution)
+            if not solution.by_mines:
+                continue
+            probabilities.update(solution.probabilities())
+
+        if mines_left is not None and all(solution.by_mines for solution in solutions):
+            interior = frontier.hidden_count - len(probabilities)
+            combined = combine_components(solutions, mines_left, interior, deadline_check)
+            if combined is not None:
+                probabilities, interior_probability = combined
+    except SearchTimeout:
+        # A move certain within one component holds whatever the others say
+        if not any(p in (0, 1) for p in probabilities.values()):
+            raise
+
+    safe, mines = set(), set()
+    if interior_probability in (0, 1):
+        constrained = set(probabilities)
+        status = frontier.status
+        interior_cells = {i for i in range(len(status))
+                          if status[i] == frontier.HIDDEN and i not in constrained}
+        (safe if interior_probability == 0 else mines).update(interior_cells)
+
+    for cell, p in probabilities.items():
+        if p == 0:
+            safe.add(cell)
+        elif p == 1:
+            mines.add(cell)
+    return safe, mines, probabilities, interior_probability, solutions
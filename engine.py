@@ -0,0 +1,274 @@
+'''
+Module Name: engine.py
+Purpose: Headless Minesweeper engine for simulations and front ends
+Input(s): None
+Output(s): None
+Original Author(s): Team 2
+Maintainer(s):  Jamie King
+                Jacob Kice
+                Gunther Luechtefeld
+                Joseph Hotze
+                Srihari Meyoor
+Outside Source(s):  None
+Updated Date: 10/17/2026
+'''
+import random
+import time
+from collections import deque
+from constants import OBS_HIDDEN, OBS_FLAGGED
+from game_state import GameState
+from grid import ArrayBoard, np
+from ai_solver import (try_basic_moves, try_121_pattern, try_least_risky_guess, make_random_move,
+                       find_certain_moves)
+from csp_solver import solve_frontier, SearchTimeout, expired, deadline_check
+from sampling import estimate_frontier, start_pool
+from ai_precompute import AIPrecompute
+
+
+def choose_ai_move(state, ai_level, rng=random, deadline=None):
+    """
+    Picks the AI's next move for the given difficulty.
+    The strategies run from cheapest to most expensive; once the
+    time.perf_counter() deadline passes, the remaining ones are skipped and
+    the AI guesses with the cheap risk estimate instead.
+    Returns (move_type, row, col) with move_type 'reveal' or 'flag',
+    or (None, None, None) when no cell is left to play.
+    """
+    # Try basic moves (medium/hard)
+    found, move_type, row, col = try_basic_moves(state.grid, state.rows, state.cols,
+                                                  state.revealed, state.flagged, ai_level,
+                                                  state.frontier)
+
+    # Try 1-2-1 and the other local patterns (hard/expert)
+    if (not found and ai_level in ['hard', 'expert'] and state.frontier is not None
+            and not expired(deadline)):
+        found, move_type, row, col = try_121_pattern(state.grid, state.rows, state.cols,
+                                                      state.revealed, state.flagged, state.frontier,
+                                                      deadline)
+
+    # Solve the frontier exactly (expert only)
+    cheap_guess = ai_level != 'expert'
+    if not found and ai_level == 'expert' and state.frontier is not None:
+        try:
+            if expired(deadline):
+                raise SearchTimeout()
+            found, move_type, row, col = try_exact_solver(state, deadline)
+        except SearchTimeout:
+            cheap_guess = True
+
+    # Guess the frontier cell least likely to be a bomb (the expert level
+    # already did so with exact odds, unless it ran out of time)
+    if not found and cheap_guess and state.frontier is not None:
+        found, move_type, row, col = try_least_risky_guess(state.frontier,
+                                                           state.num_bombs - state.flags_placed)
+
+    # Make random move if no pattern found
+    if not found:
+        found, row, col = make_random_move(state.rows, state.cols, state.revealed, state.flagged, rng,
+                                           state.hidden, state.frontier)
+        move_type = 'reveal'
+
+    if not found:
+        return None, None, None
+    return move_type, row, col
+
+
+def try_exact_solver(state, deadline=None):
+    """
+    Uses the exact solver on the frontier, with the global mine count: plays
+    a certain move if there is one, otherwise reveals the frontier cell least
+    likely to be a bomb when it is safer than a cell away from the frontier.
+    Components too large to enumerate are estimated by sampling instead.
+    Raises SearchTimeout if the enumeration does not finish by the deadline.
+    Returns (found, move_type, row, col)
+    """
+    mines_left = state.num_bombs - state.flags_placed
+    safe, mines, probabilities, interior_probability, solutions = solve_frontier(
+        state.frontier, deadline_check(deadline), mines_left)
+    if not safe and not mines and any(solution.by_mines is None for solution in solutions):
+        for estimate in estimate_frontier(state.frontier, rng=state.rng, deadline=deadline):
+            probabilities.update(estimate.probabilities)
+        # The bombs the frontier is expected to hold are spread over the rest
+        interior = state.frontier.hidden_count - len(probabilities)
+        if interior > 0:
+            expected = max(0.0, mines_left - sum(probabilities.values()))
+            interior_probability = min(1.0, expected / interior)
+
+    cols = state.cols
+    if safe:
+        i = min(safe)
+        return True, 'reveal', i // cols, i % cols
+    if mines:
+        i = min(mines)
+        return True, 'flag', i // cols, i % cols
+    if not probabilities:
+        return False, None, None, None
+
+    i = min(probabilities, key=probabilities.get)
+    if interior_probability is not None and interior_probability < probabilities[i]:
+        return False, None, None, None
+    return True, 'reveal', i // cols, i % cols
+
+
+class Engine:
+    """
+    Headless game engine: no pygame or display is needed, so it can run in
+    tests, batch jobs and worker processes. The pygame front end in main.py
+    drives the same engine.
+
+    Typical use:
+        engine = Engine()
+        engine.reset(9, 9, 10, seed=1)
+        while not engine.done:
+            engine.step('reveal', row, col)
+    """
+
+    def __init__(self):
+        self.rng = random.Random()
+        self.state = None
+        self.pending = deque()
+        self.precompute = AIPrecompute()
+
+    def reset(self, rows, cols, mines, seed=None, ai_level=None):
+        """
+        Starts a new game and returns its observation.
+        For the expert level the sampling workers are started here, so they
+        are ready before the AI's first timed move.
+        """
+        self.precompute.stop()
+        if ai_level == 'expert':
+            start_pool()
+        if seed is not None:
+            self.rng.seed(seed)
+        self.pending.clear()
+        if self.state is not None and (self.state.rows, self.state.cols, self.state.num_bombs) == (rows, cols, mines):
+            self.state.reset()
+        else:
+            self.state = GameState(rows, cols, mines, self.rng)
+        return self.observation()
+
+    def step(self, action, row, col):
+        """
+        Applies 'reveal' or 'flag' at (row, col).
+        Returns (changed_cells, done, won): the cells whose state changed,
+        and whether the game is over and won.
+        Queued AI deductions are dropped, since they may rely on a flag that
+        this move removes.
+        """
+        self.pending.clear()
+        changed, done, won = self._play(action, row, col)
+        cols = self.state.cols
+        self.precompute.touch(r * cols + c for r, c in changed)
+        return changed, done, won
+
+    def think_ahead(self, ai_level):
+        """
+        Starts analyzing the position in the background for the AI's next
+        move (expert level, whose enumeration is worth precomputing). Call it
+        when the turn passes to the player; the AI's next step stops it.
+        """
+        state = self.state
+        if ai_level == 'expert' and state.frontier is not None and not state.game_over:
+            self.precompute.start(state.frontier)
+
+    def _play(self, action, row, col):
+        if action == 'reveal':
+            changed = self.state.reveal(row, col)
+        elif action == 'flag':
+            changed = [(row, col)] if self.state.toggle_flag(row, col) else []
+        else:
+            raise ValueError(f"Unknown action: {action}")
+        return changed, self.state.game_over, self.state.game_won
+
+    def ai_step(self, ai_level, budget=None):
+        """
+        Lets the AI play one move; returns step()'s result.
+        Certain moves are found a whole wave at a time and queued, so the
+        search runs once per wave instead of once per move.
+        With a budget (ms) the AI stops thinking when it runs out and plays
+        the best move found so far.
+        """
+        deadline = None if budget is None else time.perf_counter() + budget / 1000
+        self.precompute.stop()
+        move = self._next_pending()
+        if move is None:
+            self._queue_certain_moves(ai_level, deadline)
+            move = self._next_pending()
+        if move is None:
+            move = choose_ai_move(self.state, ai_level, self.rng, deadline)
+        move_type, row, col = move
+        if move_type is None:
+            return [], self.state.game_over, self.state.game_won
+        return self._play(move_type, row, col)
+
+    def ai_batch_step(self, ai_level, budget=None):
+        """
+        Lets the AI play every certain move it can find in one go, or a
+        single guess when there is none; returns step()'s result.
+        budget works as in ai_step.
+        """
+        deadline = None if budget is None else time.perf_counter() + budget / 1000
+        self.precompute.stop()
+        self.pending.clear()
+        state = self.state
+        safe, mines = find_certain_moves(state.grid, state.rows, state.cols, state.revealed,
+                                         state.flagged, ai_level, state.frontier,
+                                         state.num_bombs - state.flags_placed, deadline)
+        if not safe and not mines:
+            move_type, row, col = choose_ai_move(state, ai_level, self.rng, deadline)
+            if move_type is None:
+                return [], state.game_over, state.game_won
+            return self._play(move_type, row, col)
+        changed = state.apply_moves(sorted(safe), sorted(mines))
+        return changed, state.game_over, state.game_won
+
+    def _queue_certain_moves(self, ai_level, deadline=None):
+        state = self.state
+        safe, mines = find_certain_moves(state.grid, state.rows, state.cols, state.revealed,
+                                         state.flagged, ai_level, state.frontier,
+                                         state.num_bombs - state.flags_placed, deadline)
+        self.pending.extend(('flag', row, col) for row, col in sorted(mines))
+        self.pending.extend(('reveal', row, col) for row, col in sorted(safe))
+
+    def _next_pending(self):
+        """Pops the next queued move whose cell is still hidden"""
+        state = self.state
+        while self.pending:
+            move_type, row, col = self.pending.popleft()
+            if (row, col) not in state.revealed and (row, col) not in state.flagged:
+                return move_type, row, col
+        return None
+
+    @property
+    def done(self):
+        return self.state.game_over
+
+    @property
+    def won(self):
+        return self.state.game_won
+
+    @property
+    def mines_left(self):
+        """Mines not yet flagged (may go negative with wrong flags)"""
+        return self.state.num_bombs - self.state.flags_placed
+
+    def cell(self, row, col):
+        """Returns what the player sees at (row, col)"""
+        if (row, col) in self.state.revealed:
+            return int(self.state.grid[row][col])
+        if (row, col) in self.state.flagged:
+            return OBS_FLAGGED
+        return OBS_HIDDEN
+
+    def observation(self):
+        """
+        Returns the visible board: the number (or -1 for a bomb) on revealed
+        cells, OBS_FLAGGED and OBS_HIDDEN elsewhere. A numpy array for an
+        ArrayBoard, a list of lists otherwise.
+        """
+        state = self.state
+        grid = state.grid
+        if isinstance(grid, ArrayBoard):
+            return np.where(grid.revealed_mask, grid.cells,
+                            np.where(grid.flagged_mask, OBS_FLAGGED, OBS_HIDDEN)).astype(np.int8)
+        return [[self.cell(row, col) for col in range(state.cols)] for row in range(state.rows)]
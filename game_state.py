@@ -0,0 +1,184 @@
+'''
+Module Name: game_state.py
+Purpose: Game state and rules for a single Minesweeper game
+Input(s): None
+Output(s): None
+Original Author(s): Team 2
+Maintainer(s):  Jamie King
+                Jacob Kice
+                Gunther Luechtefeld
+                Joseph Hotze
+                Srihari Meyoor
+Outside Source(s):  None
+Updated Date: 10/17/2026
+'''
+import random
+import time
+from grid import new_grid, place_bombs, ensure_safe_start, ZeroRegionIndex
+from cell_state import new_cell_sets, CellPool
+from ai_solver import Frontier
+
+
+class GameState:
+    """
+    Owns the board of one game and applies reveals and flags to it.
+    Keeps running counters (safe cells revealed, flags placed, hidden cells)
+    so the win check and the UI counts are O(1), a CellPool of the hidden,
+    unflagged cells for random guesses, and keeps the solver's Frontier up
+    to date once the bombs are placed. Cells that changed since the last
+    take_changes() are recorded for the renderer.
+    """
+
+    __slots__ = ('rows', 'cols', 'num_bombs', 'rng', 'grid', 'bombs', 'regions',
+                 'revealed', 'flagged', 'first_click', 'game_started', 'start_time',
+                 'game_over', 'game_won', 'revealed_safe', 'flags_placed',
+                 'hidden_count', 'hidden', 'frontier', 'changes')
+
+    def __init__(self, rows, cols, num_bombs, rng=random):
+        self.rows = rows
+        self.cols = cols
+        self.num_bombs = num_bombs
+        self.rng = rng
+        self.reset()
+
+    def reset(self):
+        """Starts a new game; the bombs are placed on the first reveal"""
+        self.grid = new_grid(self.rows, self.cols)
+        self.bombs = None
+        self.regions = ZeroRegionIndex(self.grid)
+        self.revealed, self.flagged = new_cell_sets(self.grid)
+        self.first_click = True
+        self.game_started = False
+        self.start_time = time.time()
+        self.game_over = False
+        self.game_won = False
+        self.revealed_safe = 0
+        self.flags_placed = 0
+        self.hidden_count = self.rows * self.cols
+        self.hidden = CellPool(self.rows * self.cols)
+        self.frontier = None
+        # None means the whole board changed
+        self.changes = None
+
+    @property
+    def safe_total(self):
+        """Number of cells without a bomb"""
+        return self.rows * self.cols - (self.num_bombs if self.bombs is None else len(self.bombs))
+
+    @property
+    def frontier_size(self):
+        """Number of revealed numbered cells that still have hidden neighbors"""
+        return 0 if self.frontier is None else len(self.frontier.cells)
+
+    def take_changes(self):
+        """
+        Returns the flat indices of the cells revealed, flagged or unflagged
+        since the last call, or None after a reset (every cell changed).
+        """
+        changes = self.changes
+        self.changes = set()
+        return changes
+
+    def start(self, row, col):
+        """Places (or moves) the bombs so the first reveal at (row, col) is safe"""
+        if self.bombs is None:
+            self.grid, self.bombs = place_bombs(self.grid, self.num_bombs, row, col, self.regions, self.rng)
+        else:
+            self.grid, self.bombs = ensure_safe_start(self.grid, row, col, self.bombs, self.regions, self.rng)
+        self.frontier = Frontier(self.rows, self.cols)
+        if self.flags_placed:
+            for r, c in self.flagged:
+                self.frontier.flag(r * self.cols + c)
+        self.first_click = False
+        self.game_started = True
+        self.start_time = time.time()
+
+    def reveal(self, row, col):
+        """
+        Reveals (row, col), flood filling from zero cells.
+        Returns the list of newly revealed cells.
+        """
+        if self.game_over or (row, col) in self.flagged or (row, col) in self.revealed:
+            return []
+        if self.first_click:
+            self.start(row, col)
+
+        if self.grid[row][col] == -1:
+            self._uncover(row * self.cols + col)
+            self.game_over = True
+            return [(row, col)]
+
+        # A zero opens its whole region, a number only itself
+        if self.grid[row][col] == 0:
+            cells = self.regions.region_indices(row, col)
+        else:
+            cells = (row * self.cols + col,)
+        newly_revealed = []
+        for i in cells:
+            if self.revealed.contains_index(i):
+                continue
+            if self.flagged.contains_index(i):
+                # A wrong flag inside an opened region is cleared
+                self._unflag(i)
+            self._uncover(i)
+            self.revealed_safe += 1
+            newly_revealed.append(divmod(i, self.cols))
+
+        if self.revealed_safe == self.safe_total:
+            self.game_won = True
+            self.game_over = True
+        return newly_revealed
+
+    def apply_moves(self, safe, mines):
+        """
+        Applies a batch of deductions: flags the mines, then reveals the safe
+        cells until the game ends. Returns the list of changed cells.
+        """
+        changed = []
+        for row, col in mines:
+            if (row, col) not in self.flagged and self.toggle_flag(row, col):
+                changed.append((row, col))
+        for row, col in safe:
+            if self.game_over:
+                break
+            changed.extend(self.reveal(row, col))
+        return changed
+
+    def toggle_flag(self, row, col):
+        """Flags or unflags a hidden cell; returns True if the board changed"""
+        if self.game_over or (row, col) in self.revealed:
+            return False
+        i = row * self.cols + col
+        if self.flagged.contains_index(i):
+            self._unflag(i)
+        else:
+            self.flagged.add_index(i)
+            self.flags_placed += 1
+            self.hidden_count -= 1
+            self.hidden.discard(i)
+            self._changed(i)
+            if self.frontier is not None:
+                self.frontier.flag(i)
+        return True
+
+    def _unflag(self, i):
+        """Bookkeeping for flagged cell i returning to the hidden state"""
+        self.flagged.discard_index(i)
+        self.flags_placed -= 1
+        self.hidden_count += 1
+        self.hidden.add(i)
+        self._changed(i)
+        if self.frontier is not None:
+            self.frontier.unflag(i)
+
+    def _uncover(self, i):
+        """Bookkeeping for hidden cell i being revealed"""
+        self.revealed.add_index(i)
+        self.hidden_count -= 1
+        self.hidden.discard(i)
+        self._changed(i)
+        self.frontier.reveal(i, self.grid[i // self.cols][i % self.cols])
+
+    def _changed(self, i):
+        if self.changes is not None:
+            self.changes.add(i)
@@ -10,46 +10,270 @@ Maintainer(s):  Jamie King
                 Joseph Hotze
                 Srihari Meyoor
 Outside Source(s):  None
-Updated Date: 10/05/2025
+Updated Date: 10/17/2026
 '''
 import random
-from constants import DIRECTIONS
+from array import array
+from functools import lru_cache
+from constants import DIRECTIONS, ARRAY_BOARD_MIN_CELLS
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, plain list grids work without it
+    np = None
 
-def generate_bombs(rows, cols, bomb_count):
+
+# Entries per cell in a neighbor_table
+NEIGHBOR_STRIDE = len(DIRECTIONS)
+
+
+@lru_cache(maxsize=2)
+def neighbor_table(rows, cols):
+    """
+    Returns an array('i') holding, from index i * NEIGHBOR_STRIDE, the flat
+    indices of cell i's in-bounds neighbors in DIRECTIONS order, followed by
+    -1 padding. Read one cell's entries with neighbors().
+    Built once per board shape; only the last two shapes are kept.
+    """
+    if np is not None:
+        entries = np.full((rows, cols, NEIGHBOR_STRIDE), -1, dtype=np.intc)
+        index = np.arange(rows * cols, dtype=np.intc).reshape(rows, cols)
+        for k, (dr, dc) in enumerate(DIRECTIONS):
+            entries[max(0, -dr):rows - max(0, dr), max(0, -dc):cols - max(0, dc), k] = \
+                index[max(0, dr):rows + min(0, dr), max(0, dc):cols + min(0, dc)]
+        # Only border cells have padding; move it behind their neighbors
+        border = {(row, col) for row in (0, rows - 1) for col in range(cols)}
+        border.update((row, col) for row in range(rows) for col in (0, cols - 1))
+        for row, col in border:
+            cell = entries[row, col]
+            cell[:] = sorted(cell, key=lambda j: j < 0)
+        table = array('i')
+        table.frombytes(memoryview(entries).cast('B'))
+        return table
+
+    table = array('i')
+    for row in range(rows):
+        for col in range(cols):
+            entries = [(row + dr) * cols + col + dc for dr, dc in DIRECTIONS
+                       if 0 <= row + dr < rows and 0 <= col + dc < cols]
+            table.extend(entries + [-1] * (NEIGHBOR_STRIDE - len(entries)))
+    return table
+
+
+def neighbors(table, i):
+    """Returns the flat indices of cell i's in-bounds neighbors from a neighbor_table"""
+    start = i * NEIGHBOR_STRIDE
+    entries = table[start:start + NEIGHBOR_STRIDE]
+    if entries[-1] < 0:
+        return entries[:entries.index(-1)]
+    return entries
+
+
+def neighbor_counts(rows, cols):
+    """Returns a bytearray with the number of in-bounds neighbors of each cell"""
+    spans = [min(col + 1, cols - 1) - max(col - 1, 0) + 1 for col in range(cols)]
+    lines = {}
+    counts = bytearray()
+    for row in range(rows):
+        span = min(row + 1, rows - 1) - max(row - 1, 0) + 1
+        if span not in lines:
+            lines[span] = bytes(span * other - 1 for other in spans)
+        counts += lines[span]
+    return counts
+
+
+class FlatCoords:
+    """
+    Maps flat indices to (row, col) tuples with divmod, for boards too large
+    to keep a tuple per cell. Indexes and iterates like cell_coords' tuple.
+    """
+
+    __slots__ = ('rows', 'cols')
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+
+    def __len__(self):
+        return self.rows * self.cols
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.rows * self.cols:
+            raise IndexError(i)
+        return divmod(i, self.cols)
+
+    def __iter__(self):
+        return ((row, col) for row in range(self.rows) for col in range(self.cols))
+
+
+@lru_cache(maxsize=2)
+def cell_coords(rows, cols):
+    """
+    Returns a tuple mapping each flat index to its (row, col) tuple, or a
+    FlatCoords for boards of ARRAY_BOARD_MIN_CELLS cells or more.
+    """
+    if rows * cols >= ARRAY_BOARD_MIN_CELLS:
+        return FlatCoords(rows, cols)
+    return tuple((row, col) for row in range(rows) for col in range(cols))
+
+
+class ArrayBoard:
+    """
+    Array-backed board: an int8 array holding -1 for bombs and the neighbor
+    count everywhere else, plus boolean revealed/flagged masks.
+    Indexes like the list-of-lists grid (board[row][col]), so the grid
+    functions in this module accept either kind of board.
+    """
+
+    def __init__(self, rows, cols):
+        if np is None:
+            raise ImportError("ArrayBoard requires numpy")
+        self.rows = rows
+        self.cols = cols
+        self.cells = np.zeros((rows, cols), dtype=np.int8)
+        self.revealed_mask = np.zeros((rows, cols), dtype=bool)
+        self.flagged_mask = np.zeros((rows, cols), dtype=bool)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, row):
+        return self.cells[row]
+
+    def bomb_mask(self):
+        """Returns a boolean array that is True on bomb cells"""
+        return self.cells == -1
+
+
+def new_grid(rows, cols, array_backed=None):
+    """
+    Returns an empty board of the given size.
+    By default large boards get an ArrayBoard when numpy is installed,
+    small boards keep the plain list of lists.
+    """
+    if array_backed is None:
+        array_backed = np is not None and rows * cols >= ARRAY_BOARD_MIN_CELLS
+    if array_backed:
+        return ArrayBoard(rows, cols)
+    return [[0 for _ in range(cols)] for _ in range(rows)]
+
+
+def count_adjacent_bombs(bomb_mask):
+    """
+    Returns an int8 array with the number of bombs around each cell.
+    Works on any array whose last two axes are rows and columns, using one
+    padded pass that sums the eight shifted copies of the mask.
+    """
+    rows, cols = bomb_mask.shape[-2:]
+    pad = [(0, 0)] * (bomb_mask.ndim - 2) + [(1, 1), (1, 1)]
+    padded = np.pad(bomb_mask.astype(np.int8), pad)
+    counts = np.zeros(bomb_mask.shape, dtype=np.int8)
+    for dr, dc in DIRECTIONS:
+        counts += padded[..., 1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+    return counts
+
+
+def generate_bombs(rows, cols, bomb_count, exclude=None, rng=random):
     """
     Returns a set of (row, col) positions for bombs.
     Clamps bomb_count to the number of cells.
+    Cells in exclude never get a bomb; they are skipped while mapping the
+    samples to positions, so the bombs are still drawn in a single pass.
     """
     total = rows * cols
-    bomb_count = max(0, min(bomb_count, total))
-    choices = random.sample(range(total), bomb_count)
-    return {(i // cols, i % cols) for i in choices}
+    skipped = sorted({r * cols + c for r, c in exclude or ()
+                      if 0 <= r < rows and 0 <= c < cols})
+    bomb_count = max(0, min(bomb_count, total - len(skipped)))
+    choices = rng.sample(range(total - len(skipped)), bomb_count)
+    
+    bombs = set()
+    for i in choices:
+        for skip in skipped:
+            if skip > i:
+                break
+            i += 1
+        bombs.add((i // cols, i % cols))
+    return bombs
+
+
+def place_bombs(grid, bomb_count, start_row, start_col, regions=None, rng=random):
+    """
+    Places the bombs of a deferred board once the first click is known.
+    The 3x3 area around the click stays clear, or just the clicked cell when
+    the board is too full for that. Returns (grid, bomb_positions).
+    """
+    rows, cols = len(grid), len(grid[0])
+    protected_area = {(start_row + dr, start_col + dc)
+                      for dr in [-1, 0, 1] for dc in [-1, 0, 1]}
+    protected_area = {(r, c) for r, c in protected_area if 0 <= r < rows and 0 <= c < cols}
+    if rows * cols - len(protected_area) < bomb_count:
+        protected_area = {(start_row, start_col)}
+    
+    bombs = generate_bombs(rows, cols, bomb_count, exclude=protected_area, rng=rng)
+    for r, c in bombs:
+        grid[r][c] = -1
+    generate_numbers(grid)
+    if regions is not None:
+        regions.invalidate()
+    return grid, bombs
 
 
 def generate_numbers(grid):
     """
     Fill in the grid with numbers based on how many bombs it's near
     """
+    if isinstance(grid, ArrayBoard):
+        bombs = grid.bomb_mask()
+        grid.cells[:] = np.where(bombs, -1, count_adjacent_bombs(bombs))
+        return
+
     rows = len(grid)
     cols = len(grid[0])
+    values = flat_values(grid)
+    table = neighbor_table(rows, cols)
     
-    for i in range(rows):
-        for j in range(cols):
-            if grid[i][j] != -1:
-                bomb_count = 0
-                for di, dj in DIRECTIONS:
-                    ni, nj = i + di, j + dj
-                    if 0 <= ni < rows and 0 <= nj < cols:
-                        if grid[ni][nj] == -1:
-                            bomb_count += 1
-                grid[i][j] = bomb_count
+    for i, (row, col) in enumerate(cell_coords(rows, cols)):
+        if values[i] != -1:
+            bomb_count = 0
+            for j in neighbors(table, i):
+                if values[j] == -1:
+                    bomb_count += 1
+            grid[row][col] = bomb_count
+
+
+def renumber_around(grid, cells):
+    """
+    Recomputes the numbers in the 3x3 neighborhoods of the given cells.
+    Used after bombs are added or removed so only the affected area is touched.
+    """
+    rows, cols = len(grid), len(grid[0])
+    table = neighbor_table(rows, cols)
+    coords = cell_coords(rows, cols)
+    touched = set()
+    for row, col in cells:
+        i = row * cols + col
+        touched.add(i)
+        touched.update(neighbors(table, i))
+
+    for i in touched:
+        row, col = coords[i]
+        if grid[row][col] == -1:
+            continue
+        bomb_count = 0
+        for j in neighbors(table, i):
+            r, c = coords[j]
+            if grid[r][c] == -1:
+                bomb_count += 1
+        grid[row][col] = bomb_count
 
 
-def ensure_safe_start(grid, start_row, start_col, bomb_positions):
+def ensure_safe_start(grid, start_row, start_col, bomb_positions, regions=None, rng=random):
     """
     Ensures the first click in minesweeper is safe and opens up an area.
-    Moves bombs if needed.
+    Moves bombs if needed. bomb_positions is updated in place and returned,
+    and the ZeroRegionIndex (if given) is invalidated when a bomb moves.
+    Replacement cells are picked by rejection sampling, so the cost does not
+    depend on the board size unless the board is almost full of bombs.
     """
     rows, cols = len(grid), len(grid[0])
     protected_area = set()
@@ -62,30 +286,212 @@ def ensure_safe_start(grid, start_row, start_col, bomb_positions):
     
     bombs_to_move = bomb_positions & protected_area
     if bombs_to_move:
-        all_positions = {(r, c) for r in range(rows) for c in range(cols)}
-        available_positions = all_positions - bomb_positions - protected_area
-        new_bomb_positions = bomb_positions.copy()
+        total = rows * cols
+        free = total - len(bomb_positions) - len(protected_area) + len(bombs_to_move)
+        
+        # Rejection sampling needs about total / free tries per pick, so
+        # dense boards list the few free cells instead
+        candidates = None
+        if free * 8 < total:
+            candidates = [(r, c) for r in range(rows) for c in range(cols)
+                          if (r, c) not in bomb_positions and (r, c) not in protected_area]
+            rng.shuffle(candidates)
         
+        changed = []
         for bomb_pos in bombs_to_move:
-            if available_positions:
-                new_pos = available_positions.pop()
-                new_bomb_positions.remove(bomb_pos)
-                new_bomb_positions.add(new_pos)
-                grid[bomb_pos[0]][bomb_pos[1]] = 0
-                grid[new_pos[0]][new_pos[1]] = -1
+            if free == 0:
+                break
+            free -= 1
+            if candidates is not None:
+                new_pos = candidates.pop()
+            else:
+                while True:
+                    i = rng.randrange(total)
+                    new_pos = (i // cols, i % cols)
+                    if new_pos not in bomb_positions and new_pos not in protected_area:
+                        break
+            bomb_positions.remove(bomb_pos)
+            bomb_positions.add(new_pos)
+            grid[bomb_pos[0]][bomb_pos[1]] = 0
+            grid[new_pos[0]][new_pos[1]] = -1
+            changed.append(bomb_pos)
+            changed.append(new_pos)
         
-        generate_numbers(grid)
-        return grid, new_bomb_positions
+        renumber_around(grid, changed)
+        if regions is not None and changed:
+            regions.invalidate()
     
     return grid, bomb_positions
 
 
-def flood_fill(grid, start_row, start_col):
+def flat_values(grid):
+    """Returns the board values as one flat list indexed by row * cols + col"""
+    if isinstance(grid, ArrayBoard):
+        return grid.cells.ravel().tolist()
+    return [value for row in grid for value in row]
+
+
+class ZeroRegionIndex:
+    """
+    Connected-component labeling of the zero cells of a board.
+    Each region holds its zero cells plus the numbered cells bordering them,
+    which is exactly what a flood fill from any of its zeros reveals.
+    The labels are built lazily and rebuilt after invalidate() is called
+    (bombs placed or moved): with numpy over the runs of zeros of an
+    ArrayBoard, with one union-find pass on a plain grid. A region's cells
+    are only collected when one of its zeros is looked up.
+    """
+
+    def __init__(self, grid):
+        self.grid = grid
+        self.labels = None
+        self.members = None
+        self.bounds = None
+
+    def invalidate(self):
+        """Marks the index stale, it is rebuilt on the next lookup"""
+        self.labels = None
+        self.members = None
+        self.bounds = None
+
+    def rebuild(self):
+        """Labels every zero cell"""
+        if isinstance(self.grid, ArrayBoard):
+            self._label_runs()
+            return
+
+        rows, cols = len(self.grid), len(self.grid[0])
+        values = flat_values(self.grid)
+        parent = list(range(rows * cols))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # Union each zero with the zeros already scanned (left and row above)
+        for row in range(rows):
+            base = row * cols
+            for col in range(cols):
+                i = base + col
+                if values[i] != 0:
+                    continue
+                for j in (i - 1 if col > 0 else -1,
+                          i - cols - 1 if row > 0 and col > 0 else -1,
+                          i - cols if row > 0 else -1,
+                          i - cols + 1 if row > 0 and col + 1 < cols else -1):
+                    if j >= 0 and values[j] == 0:
+                        root_i, root_j = find(i), find(j)
+                        if root_i != root_j:
+                            parent[root_j] = root_i
+
+        labels = [-1] * (rows * cols)
+        members = {}
+        for i in range(rows * cols):
+            if values[i] == 0:
+                labels[i] = find(i)
+                members.setdefault(labels[i], []).append(i)
+        self.labels = labels
+        self.members = members
+
+    def _label_runs(self):
+        """
+        Labels the zeros of an ArrayBoard: each row's runs of zeros are
+        found with one diff, runs in neighboring rows that touch (diagonals
+        included) are joined, and the run graph is labeled by hooking every
+        label onto the smallest one it touches until nothing changes.
+        Also records each region's bounding box, so a lookup only scans it.
+        """
+        zero = self.grid.cells == 0
+        rows, cols = zero.shape
+        edges = np.diff(np.pad(zero.astype(np.int8), ((0, 0), (1, 1))), axis=1)
+        run_rows, starts = np.nonzero(edges == 1)
+        ends = np.nonzero(edges == -1)[1]
+
+        # Run a touches run b of the next row when b starts at most one past
+        # a's end and ends at most one before a's start; runs are sorted, so
+        # the candidates of a are one contiguous range
+        width = cols + 2
+        start_keys = run_rows * width + starts
+        end_keys = run_rows * width + ends
+        first = np.searchsorted(end_keys, (run_rows + 1) * width + starts)
+        last = np.searchsorted(start_keys, (run_rows + 1) * width + ends, side='right')
+        counts = np.maximum(last - first, 0)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        run_a = np.repeat(np.arange(len(starts)), counts)
+        run_b = np.repeat(first, counts) + offsets
+
+        labels = np.arange(len(starts))
+        while True:
+            low = np.minimum(labels[run_a], labels[run_b])
+            high = np.maximum(labels[run_a], labels[run_b])
+            joined = low != high
+            if not joined.any():
+                break
+            np.minimum.at(labels, high[joined], low[joined])
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+
+        # A region's label is its first run, so that run holds its top row
+        bounds = np.empty((len(starts), 4), dtype=np.int64)
+        bounds[:, 0] = run_rows
+        bounds[:, 1] = run_rows
+        bounds[:, 2] = starts
+        bounds[:, 3] = ends
+        np.minimum.at(bounds[:, 2], labels, starts)
+        np.maximum.at(bounds[:, 1], labels, run_rows)
+        np.maximum.at(bounds[:, 3], labels, ends)
+
+        # The zero cells in row-major order are exactly the runs in order
+        cell_labels = np.full(rows * cols, -1, dtype=np.int64)
+        cell_labels[np.flatnonzero(zero)] = np.repeat(labels, ends - starts)
+        self.labels = cell_labels.reshape(rows, cols)
+        self.bounds = bounds
+
+    def region_indices(self, row, col):
+        """Returns the flat indices of the cells revealed by clicking the zero cell (row, col)"""
+        if self.labels is None:
+            self.rebuild()
+        cols = len(self.grid[0])
+
+        if self.bounds is None:
+            table = neighbor_table(len(self.grid), cols)
+            cells = set()
+            for i in self.members[self.labels[row * cols + col]]:
+                cells.add(i)
+                cells.update(neighbors(table, i))
+            return list(cells)
+
+        label = self.labels[row, col]
+        top, bottom, left, right = self.bounds[label]
+        top, left = max(0, top - 1), max(0, left - 1)
+        bottom, right = min(len(self.grid) - 1, bottom + 1), min(cols, right + 1)
+        zeros = self.labels[top:bottom + 1, left:right] == label
+        padded = np.pad(zeros, 1)
+        height, width = zeros.shape
+        region = zeros.copy()
+        for dr, dc in DIRECTIONS:
+            region |= padded[1 + dr:1 + dr + height, 1 + dc:1 + dc + width]
+        region_rows, region_cols = np.nonzero(region)
+        return ((region_rows + top) * cols + region_cols + left).tolist()
+
+    def region(self, row, col):
+        """Returns the cells revealed by clicking the zero cell (row, col)"""
+        cols = len(self.grid[0])
+        return {divmod(i, cols) for i in self.region_indices(row, col)}
+
+
+def flood_fill(grid, start_row, start_col, regions=None):
     """
     Floodfill algorithm that reveals cells with 0 bombs around them,
     and stops at cells with numbers.
+    If a ZeroRegionIndex is given, zero cells return their precomputed region.
     """
-    if not grid or not grid[0]:
+    if len(grid) == 0 or len(grid[0]) == 0:
         return set()
     
     rows = len(grid)
@@ -96,29 +502,29 @@ def flood_fill(grid, start_row, start_col):
         grid[start_row][start_col] == -1):
         return set()
     
-    to_reveal = set()
-    to_visit = [(start_row, start_col)]
+    if grid[start_row][start_col] > 0:
+        return {(start_row, start_col)}
+    
+    if regions is not None:
+        return regions.region(start_row, start_col)
+    
+    # Cells are marked when queued, so each one is pushed at most once
+    table = neighbor_table(rows, cols)
+    coords = cell_coords(rows, cols)
+    start = start_row * cols + start_col
+    seen = {start}
+    to_visit = [start]
     
     while to_visit:
-        row, col = to_visit.pop()
-        
-        if (row < 0 or row >= rows or col < 0 or col >= cols or
-            (row, col) in to_reveal):
-            continue
-        
-        if grid[row][col] == -1:
-            continue
-        
-        to_reveal.add((row, col))
+        i = to_visit.pop()
+        row, col = coords[i]
         
-        if grid[row][col] > 0:
+        if grid[row][col] != 0:
             continue
         
-        if grid[row][col] == 0:
-            for dr, dc in DIRECTIONS:
-                new_row, new_col = row + dr, col + dc
-                if (0 <= new_row < rows and 0 <= new_col < cols and
-                    (new_row, new_col) not in to_reveal):
-                    to_visit.append((new_row, new_col))
+        for j in neighbors(table, i):
+            if j not in seen:
+                seen.add(j)
+                to_visit.append(j)
     
-    return to_reveal
+    return {coords[i] for i in seen}
@@ -10,15 +10,16 @@ Maintainer(s):  Jamie King
                 Joseph Hotze
                 Srihari Meyoor
 Outside Source(s):  None
-Updated Date: 10/05/2025
+Updated Date: 10/17/2026
 '''
 import os
 import pygame
 import time
 from constants import *
-from grid import generate_bombs, generate_numbers, ensure_safe_start, flood_fill
-from ai_solver import try_basic_moves, try_121_pattern, make_random_move
-from ui import draw_game_over_popup, draw_board, draw_ui, options
+from engine import Engine
+from ai_scheduler import AIScheduler
+from viewport import Viewport
+from ui import draw_game_over_popup, draw_ui, options, next_events, BoardRenderer
 
 
 def get_game_settings():
@@ -55,102 +56,100 @@ def get_game_settings():
     return board_rows, board_columns, num_bombs, cell_size, ai_mode, ai_level
 
 
-def initialize_game(board_rows, board_columns, num_bombs):
-    """Initialize a new game"""
-    grid = [[0 for _ in range(board_columns)] for _ in range(board_rows)]
-    bombs = generate_bombs(board_rows, board_columns, num_bombs)
+def handle_ai_move(engine, ai_level, scheduler, single_move=False):
+    """
+    Play the AI moves that are due this frame; returns True if one was played.
+    Never blocks: the scheduler compares timestamps against the frame clock.
+    In turbo speed the AI applies whole waves of certain moves and keeps
+    playing until the frame budget is used, unless single_move is set
+    (interactive mode, one move per turn). Each move's thinking is capped at
+    AI_THINK_BUDGET ms.
+    """
+    frame_start = now = pygame.time.get_ticks()
+    scheduler.arm(now)
+    played = False
     
-    for r, c in bombs:
-        grid[r][c] = -1
-    generate_numbers(grid)
+    while not engine.done and scheduler.ready(now):
+        if scheduler.turbo and not single_move:
+            engine.ai_batch_step(ai_level, AI_THINK_BUDGET)
+        else:
+            engine.ai_step(ai_level, AI_THINK_BUDGET)
+        scheduler.played()
+        played = True
+        
+        now = pygame.time.get_ticks()
+        if single_move or not scheduler.turbo or now - frame_start >= AI_TURBO_FRAME_BUDGET:
+            break
+        scheduler.arm(now)
     
-    return grid, bombs
+    return played
 
 
-def handle_ai_move(grid, board_rows, board_columns, revealed, flagged, bombs, 
-                   ai_level, first_click, game_started, start_time):
-    """Execute AI move and return updated game state"""
-    time.sleep(1)
-    
-    # Try basic moves (medium/hard)
-    found, move_type, row, col = try_basic_moves(grid, board_rows, board_columns, 
-                                                  revealed, flagged, ai_level)
-    
-    # Try 1-2-1 pattern (hard only)
-    if not found and ai_level == 'hard':
-        found, move_type, row, col = try_121_pattern(grid, board_rows, board_columns, 
-                                                      revealed, flagged)
-    
-    # Make random move if no pattern found
-    if not found:
-        found, row, col = make_random_move(board_rows, board_columns, revealed, flagged)
-        move_type = 'reveal'
-    
-    if found:
-        if move_type == 'flag':
-            flagged.add((row, col))
-        elif move_type == 'reveal':
-            if first_click:
-                grid, bombs = ensure_safe_start(grid, row, col, bombs)
-                first_click = False
-                game_started = True
-                start_time = time.time()
-            
-            if grid[row][col] == -1:
-                revealed.add((row, col))
-                return grid, bombs, revealed, flagged, first_click, game_started, start_time, True, False
-            else:
-                new_reveals = flood_fill(grid, row, col)
-                revealed.update(new_reveals)
-                
-                total_safe_cells = board_rows * board_columns - len(bombs)
-                if len(revealed) == total_safe_cells:
-                    return grid, bombs, revealed, flagged, first_click, game_started, start_time, True, True
-    
-    return grid, bombs, revealed, flagged, first_click, game_started, start_time, False, False
+def idle_timeout(state, ai_active, scheduler):
+    """
+    Returns how long (ms) the loop may sleep waiting for input: until the
+    AI's next move or the timer's next second, at most IDLE_WAIT_MAX.
+    """
+    timeout = IDLE_WAIT_MAX
+    if ai_active and not scheduler.paused:
+        if scheduler.next_move_at is None:
+            return 0
+        timeout = min(timeout, scheduler.next_move_at - pygame.time.get_ticks())
+    if state.game_started and not state.game_over:
+        timeout = min(timeout, 1000 - int((time.time() - state.start_time) * 1000) % 1000)
+    return max(0, timeout)
 
 
-def handle_player_click(event, mx, my, cell_size, board_rows, board_columns, grid, 
-                       revealed, flagged, bombs, first_click, game_started, start_time):
-    """Handle player mouse click"""
-    game_over = False
-    game_won = False
-    
-    if my > UI_HEIGHT:
-        col = mx // cell_size
-        row = (my - UI_HEIGHT) // cell_size
+def handle_player_click(event, mx, my, viewport, engine):
+    """
+    Handle player mouse click; returns True if the board changed.
+    Only the left (reveal) and right (flag) buttons play, so wheel ticks and
+    middle-button drags never use up the player's turn.
+    """
+    if event.button not in (1, 3):
+        return False
+    cell = viewport.cell_at(mx, my)
+    if cell is not None:
+        row, col = cell
         
-        if 0 <= row < board_rows and 0 <= col < board_columns:
-            # Right click for flagging
-            if event.button == 3:
-                if (row, col) not in revealed:
-                    if (row, col) in flagged:
-                        flagged.remove((row, col))
-                    else:
-                        flagged.add((row, col))
-            
-            # Left click for revealing
-            elif event.button == 1:
-                if (row, col) not in flagged:
-                    if first_click:
-                        grid, bombs = ensure_safe_start(grid, row, col, bombs)
-                        first_click = False
-                        game_started = True
-                        start_time = time.time()
-                    
-                    if grid[row][col] == -1:
-                        revealed.add((row, col))
-                        game_over = True
-                    else:
-                        new_reveals = flood_fill(grid, row, col)
-                        revealed.update(new_reveals)
-                        
-                        total_safe_cells = board_rows * board_columns - len(bombs)
-                        if len(revealed) == total_safe_cells:
-                            game_won = True
-                            game_over = True
+        # Right click for flagging
+        if event.button == 3:
+            changed, _, _ = engine.step('flag', row, col)
+            return bool(changed)
+        
+        # Left click for revealing
+        elif event.button == 1:
+            changed, _, _ = engine.step('reveal', row, col)
+            return bool(changed)
     
-    return grid, bombs, revealed, flagged, first_click, game_started, start_time, game_over, game_won
+    return False
+
+
+def handle_view_event(event, viewport):
+    """
+    Pans and zooms the board view: arrow keys pan, +/- and the mouse wheel
+    zoom (the wheel around the pointer), dragging with the middle button
+    moves the board. Returns True if the event was used.
+    """
+    if event.type == pygame.KEYDOWN:
+        pans = {pygame.K_LEFT: (-PAN_STEP, 0), pygame.K_RIGHT: (PAN_STEP, 0),
+                pygame.K_UP: (0, -PAN_STEP), pygame.K_DOWN: (0, PAN_STEP)}
+        if event.key in pans:
+            viewport.pan(*pans[event.key])
+            return True
+        if event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+            viewport.zoom(1)
+            return True
+        if event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            viewport.zoom(-1)
+            return True
+    elif event.type == pygame.MOUSEWHEEL:
+        viewport.zoom(event.y, pygame.mouse.get_pos())
+        return True
+    elif event.type == pygame.MOUSEMOTION and event.buttons[1]:
+        viewport.pan(-event.rel[0], -event.rel[1])
+        return True
+    return False
 
 
 def main():
@@ -169,88 +168,128 @@ def main():
         cell_size = (BOARD_WIDTH - UI_HEIGHT) // board_columns
     else:
         cell_size = (BOARD_HEIGHT - UI_HEIGHT) // board_rows
+    
+    # Large boards do not fit: they start at the smallest cell size and
+    # are panned and zoomed through the viewport
+    viewport = Viewport(board_rows, board_columns, BOARD_WIDTH, BOARD_HEIGHT - UI_HEIGHT,
+                        top=UI_HEIGHT, cell_size=cell_size)
 
     pygame.font.init()
-    font = pygame.font.Font(None, cell_size // 2)
     
-    # Initialize game
-    grid, bombs = initialize_game(board_rows, board_columns, num_bombs)
+    # Initialize game (bombs are placed on the first reveal); the AI's
+    # workers are started now and kept for later games
+    engine = Engine()
+    engine.reset(board_rows, board_columns, num_bombs, ai_level=ai_level if ai_mode != 'off' else None)
     
-    print(f"💣 Bombs placed: {len(bombs)} / {num_bombs}  ✅  Grid: {board_rows}x{board_columns} 🧩")
+    print(f"💣 Bombs to place: {num_bombs}  ✅  Grid: {board_rows}x{board_columns} 🧩")
     
-    # Game state
-    revealed = set()
-    flagged = set()
-    first_click = True
     running = True
-    game_over = False
-    game_won = False
-    start_time = time.time()
-    game_started = False
     players_turn = True
+    scheduler = AIScheduler()
+    ai_status = None
+    
+    # The board is kept off-screen and only changed cells are pushed to the
+    # display; the UI bar above it is repainted when one of its labels changes
+    renderer = BoardRenderer(viewport)
+    ui_rect = pygame.Rect(0, 0, BOARD_WIDTH, UI_HEIGHT)
+    ui_shown = None
+    screen.fill(COLOR_WHITE)
+    pygame.display.flip()
+    popup_buttons = None
+    
+    # Frames are capped at FPS_CAP, and when nothing is animating the loop
+    # sleeps until an event arrives, the AI is due or the timer ticks
+    clock = pygame.time.Clock()
+    events = []
     
     while running:
-        screen.fill(COLOR_WHITE)
-        
-        # Calculate elapsed time
-        elapsed_time = int(time.time() - start_time) if game_started and not game_over else 0
-        
-        # Draw UI
-        draw_ui(screen, elapsed_time, num_bombs, len(flagged), game_started, game_over)
+        state = engine.state
+        ai_active = not state.game_over and (ai_mode == 'automatic' or (ai_mode == 'interactive' and not players_turn))
         
         # AI move logic
-        if not game_over and (ai_mode == 'automatic' or (ai_mode == 'interactive' and not players_turn)):
-            result = handle_ai_move(grid, board_rows, board_columns, revealed, flagged, bombs,
-                                   ai_level, first_click, game_started, start_time)
-            grid, bombs, revealed, flagged, first_click, game_started, start_time, game_over, game_won = result
-            players_turn = True
+        if ai_active:
+            if handle_ai_move(engine, ai_level, scheduler, ai_mode == 'interactive'):
+                players_turn = True
+                if ai_mode == 'interactive':
+                    # Work out the AI's reply while the player thinks
+                    engine.think_ahead(ai_level)
         
         # Handle events
-        for event in pygame.event.get():
+        for event in events + pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             
+            # Arrows, +/-, the wheel and middle-button drags move the view
+            if handle_view_event(event, viewport):
+                continue
+            
+            # P pauses the AI, S cycles its speed
+            if event.type == pygame.KEYDOWN and ai_mode != 'off':
+                if event.key == pygame.K_p:
+                    scheduler.toggle_pause()
+                elif event.key == pygame.K_s:
+                    scheduler.cycle_speed(pygame.time.get_ticks())
+            
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mx, my = pygame.mouse.get_pos()
                 
                 # Handle game over popup clicks
-                if game_over:
-                    play_again_rect, quit_rect = draw_game_over_popup(screen, BOARD_WIDTH, BOARD_HEIGHT, 
-                                                                       ai_mode, players_turn, game_won)
+                if state.game_over and popup_buttons is not None:
+                    play_again_rect, quit_rect = popup_buttons
                     if play_again_rect.collidepoint(mx, my):
                         # Reset game
-                        grid, bombs = initialize_game(board_rows, board_columns, num_bombs)
-                        revealed = set()
-                        flagged = set()
-                        first_click = True
-                        game_over = False
-                        game_won = False
-                        game_started = False
+                        engine.reset(board_rows, board_columns, num_bombs)
+                        scheduler.cancel()
                         players_turn = True
+                        # The popup covered the whole window
+                        popup_buttons = None
+                        ui_shown = None
+                        screen.fill(COLOR_WHITE)
+                        pygame.display.flip()
                         continue
                     elif quit_rect.collidepoint(mx, my):
                         running = False
                         continue
                 
                 # Handle game board clicks (only if not game over and player's turn)
-                if not game_over and ai_mode != 'automatic' and players_turn:
-                    result = handle_player_click(event, mx, my, cell_size, board_rows, board_columns,
-                                                grid, revealed, flagged, bombs, first_click, 
-                                                game_started, start_time)
-                    grid, bombs, revealed, flagged, first_click, game_started, start_time, game_over, game_won = result
-                    
-                    if ai_mode == 'interactive':
+                if not state.game_over and ai_mode != 'automatic' and players_turn:
+                    # Only a move that changed the board hands the turn over
+                    if handle_player_click(event, mx, my, viewport, engine) and ai_mode == 'interactive':
                         players_turn = False
         
-        # Draw board
-        draw_board(screen, grid, board_rows, board_columns, cell_size, revealed, flagged, font)
+        # Draw the board cells that changed
+        state = engine.state
+        dirty = renderer.update(screen, state)
         
-        # Draw game over popup if game is over
-        if game_over:
-            draw_game_over_popup(screen, BOARD_WIDTH, BOARD_HEIGHT, ai_mode, players_turn, game_won)
+        if state.game_over:
+            # Draw game over popup once, over the whole window, when the game ends
+            if popup_buttons is None:
+                renderer.blit_all(screen)
+                popup_buttons = draw_game_over_popup(screen, BOARD_WIDTH, BOARD_HEIGHT, ai_mode,
+                                                     players_turn, state.game_won)
+                pygame.display.flip()
+        else:
+            # Calculate elapsed time
+            elapsed_time = int(time.time() - state.start_time) if state.game_started else 0
+            
+            # Draw UI when one of its labels changed (the timer once a second)
+            if ai_mode != 'off':
+                ai_status = scheduler.status()
+            ui_content = (elapsed_time, state.flags_placed, state.game_started, ai_status)
+            if ui_content != ui_shown:
+                ui_shown = ui_content
+                screen.fill(COLOR_WHITE, ui_rect)
+                draw_ui(screen, elapsed_time, num_bombs, state.flags_placed, state.game_started,
+                        state.game_over, ai_status)
+                dirty.append(ui_rect)
+            
+            # Update display
+            if dirty:
+                pygame.display.update(dirty)
         
-        # Update display
-        pygame.display.flip()
+        clock.tick(FPS_CAP)
+        ai_active = not state.game_over and (ai_mode == 'automatic' or (ai_mode == 'interactive' and not players_turn))
+        events = next_events(idle_timeout(state, ai_active, scheduler))
     
     pygame.quit()
 
@@ -3,9 +3,9 @@ import pygame
 import random
 import time
 from ui import options
+from grid import ensure_safe_start
+from ai_scheduler import AIScheduler
 
-pygame.init()
-os.system('clear' if os.name != 'nt' else 'cls') # gets rid of stupid warning
 
 BOARD_WIDTH: int = 500
 BOARD_HEIGHT: int = 600
@@ -21,35 +21,6 @@ def generate_bombs(rows: int, cols: int, bomb_count: int) -> set[tuple[int, int]
     choices = random.sample(range(total), bomb_count)  # unique cells
     return {(i // cols, i % cols) for i in choices}
 
-def ensure_safe_start(grid: list[list[int]], start_row: int, start_col: int, bomb_positions: set[tuple[int, int]]) -> tuple[list[list[int]], set[tuple[int, int]]]:
-    """
-    Ensures the first click in minesweeper is safe and opens up an area.
-    Moves bombs if needed.
-   """
-    rows, cols = len(grid), len(grid[0])
-    protected_area = set()
-    for dr in [-1, 0, 1]:
-        for dc in [-1, 0, 1]:
-            r, c = start_row + dr, start_col + dc
-            if 0 <= r < rows and 0 <= c < cols:
-                protected_area.add((r, c))
-    bombs_to_move = bomb_positions & protected_area #set union
-    if bombs_to_move:
-        all_positions = {(r, c) for r in range(rows) for c in range(cols)}
-        available_positions = all_positions - bomb_positions - protected_area
-        new_bomb_positions = bomb_positions.copy()
-        for bomb_pos in bombs_to_move:
-            if available_positions:
-                new_pos = available_positions.pop()
-                new_bomb_positions.remove(bomb_pos)
-                new_bomb_positions.add(new_pos)
-                grid[bomb_pos[0]][bomb_pos[1]] = 0
-                grid[new_pos[0]][new_pos[1]] = -1
-        generate_numbers(grid) #this could be optimized to only update affected areas
-        return grid, new_bomb_positions
-    return grid, bomb_positions
-
-
 def flood_fill(grid: list[list[int]], start_row: int, start_col: int) -> set[tuple[int, int]]:
     """
     Floodfill algorithm that reveals cells with 0 bombs around them, and stops at cells with numbers.
@@ -200,6 +171,9 @@ def is_hidden(row, col, revealed, flagged):
     return ((row, col) not in revealed) and ((row, col) not in flagged)
 
 def main():
+    pygame.init()
+    os.system('clear' if os.name != 'nt' else 'cls') # gets rid of stupid warning
+
     # Grid size
 
     # get user values for board size and bombs
@@ -265,6 +239,7 @@ def main():
     
     
     players_turn = True  #for interactive mode: True if it is player's turn, False if it is computer's turn
+    ai_scheduler = AIScheduler()  #paces AI moves without blocking the loop
 
     while running:
 
@@ -292,8 +267,11 @@ def main():
         
 
         # AI Solver
-        if not game_over and (ai_mode == 'automatic' or (ai_mode == 'interactive' and not players_turn)):
-            time.sleep(1)
+        ai_turn = not game_over and (ai_mode == 'automatic' or (ai_mode == 'interactive' and not players_turn))
+        if ai_turn:
+            ai_scheduler.arm(pygame.time.get_ticks())
+        if ai_turn and ai_scheduler.ready(pygame.time.get_ticks()):
+            ai_scheduler.played()
             found = False
             if ai_level == 'medium' or ai_level == 'hard':
                 for row in range(board_rows):
@@ -497,6 +475,11 @@ def main():
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            if event.type == pygame.KEYDOWN and ai_mode != 'off':  # P pauses the AI, S cycles its speed
+                if event.key == pygame.K_p:
+                    ai_scheduler.toggle_pause()
+                elif event.key == pygame.K_s:
+                    ai_scheduler.cycle_speed(pygame.time.get_ticks())
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mx, my = pygame.mouse.get_pos()
                 
@@ -620,4 +603,5 @@ def main():
         pygame.display.flip()
     pygame.quit()
 
-main()
+if __name__ == "__main__":
+    main()
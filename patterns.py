@@ -0,0 +1,169 @@
+'''
+Module Name: patterns.py
+Purpose: Table of local Minesweeper patterns for the AI solver
+Input(s): None
+Output(s): None
+Original Author(s): Team 2
+Maintainer(s):  Jamie King
+                Jacob Kice
+                Gunther Luechtefeld
+                Joseph Hotze
+                Srihari Meyoor
+Outside Source(s):  None
+Updated Date: 10/17/2026
+'''
+from constants import DIRECTIONS
+from csp_solver import SearchTimeout
+
+# Known local configurations, one string per board row. Digits are revealed
+# cells showing that many bombs not yet flagged around them.
+#   B  blocked: revealed, flagged or off the board
+#   H  hidden, nothing deduced
+#   S  hidden, safe        M  hidden, bomb
+#   s  anything, safe if hidden
+#   ?  anything
+# Every rotation and reflection is added automatically, so new patterns
+# only need to be written once here.
+PATTERNS = {
+    '1-2-1': [
+        'B B B B B',
+        'B 1 2 1 B',
+        's M S M s',
+    ],
+    '1-2-2-1': [
+        'B B B B B B',
+        'B 1 2 2 1 B',
+        's S M M S s',
+    ],
+    'wall 1-1': [
+        'B B B B',
+        'B 1 1 ?',
+        'B H H S',
+    ],
+    'wall 1-2': [
+        'B B B B',
+        'B 1 2 B',
+        'B H H M',
+    ],
+}
+
+# Transforms of an offset (dr, dc): the four rotations and their mirrors
+_SYMMETRIES = [
+    lambda dr, dc: (dr, dc),
+    lambda dr, dc: (dc, -dr),
+    lambda dr, dc: (-dr, -dc),
+    lambda dr, dc: (-dc, dr),
+    lambda dr, dc: (dr, -dc),
+    lambda dr, dc: (-dc, -dr),
+    lambda dr, dc: (-dr, dc),
+    lambda dr, dc: (dc, dr),
+]
+
+
+def compile_patterns(patterns):
+    """
+    Builds the lookup table for the patterns, keyed on what a frontier cell
+    can read off its own neighborhood: (anchor number, hidden mask), where
+    bit k of the mask is set when the neighbor at DIRECTIONS[k] is hidden.
+    A pattern is filed under every mask its 3x3 area allows ('?' and 's'
+    match either way), so a cell only scans the patterns that fit it.
+    Returns {(anchor, mask): [(layout, table), ...]} where layout is the
+    tuple of (dr, dc, is_number) positions a group of patterns looks at, and
+    table maps the signature read at those positions to (deductions,
+    maybe_safe): (dr, dc, move) tuples and (dr, dc) cells that are safe if
+    hidden.
+    """
+    groups = {}
+    for rows in patterns.values():
+        symbols = [row.split() for row in rows]
+        cells = [(r, c, symbol) for r, row in enumerate(symbols) for c, symbol in enumerate(row)]
+        anchor_r, anchor_c = next((r, c) for r, c, symbol in cells if symbol.isdigit())
+        anchor = int(symbols[anchor_r][anchor_c])
+
+        for transform in _SYMMETRIES:
+            placed = [(transform(r - anchor_r, c - anchor_c), symbol) for r, c, symbol in cells]
+            layout = tuple(sorted((dr, dc, symbol.isdigit()) for (dr, dc), symbol in placed
+                                  if symbol not in '?s'))
+            lookup = {(dr, dc): symbol for (dr, dc), symbol in placed}
+            signature = tuple(int(lookup[dr, dc]) if is_number else int(lookup[dr, dc] in 'HSM')
+                              for dr, dc, is_number in layout)
+            deductions = tuple(sorted((dr, dc, 'reveal' if symbol == 'S' else 'flag')
+                                      for (dr, dc), symbol in placed if symbol in 'SM'))
+            maybe_safe = tuple(sorted((dr, dc) for (dr, dc), symbol in placed if symbol == 's'))
+
+            masks = [0]
+            for k, offset in enumerate(DIRECTIONS):
+                symbol = lookup.get(offset, '?')
+                if symbol in 'HSM':
+                    masks = [mask | 1 << k for mask in masks]
+                elif symbol in '?s':
+                    masks += [mask | 1 << k for mask in masks]
+            for mask in masks:
+                table = groups.setdefault((anchor, mask), {}).setdefault(layout, {})
+                table[signature] = (deductions, maybe_safe)
+
+    return {key: list(layouts.items()) for key, layouts in groups.items()}
+
+
+PATTERN_TABLE = compile_patterns(PATTERNS)
+PATTERN_ANCHORS = frozenset(anchor for anchor, _ in PATTERN_TABLE)
+
+
+def match_patterns(frontier, cells=None, deadline_check=None):
+    """
+    Looks every frontier cell (or the given flat indices) up in the pattern
+    table. deadline_check works as in csp_solver.solve_component; when it
+    raises, the matches found so far are returned.
+    Returns (safe, mines) as sets of flat indices.
+    """
+    safe, mines = set(), set()
+    try:
+        _match_cells(frontier, frontier.cells if cells is None else cells, safe, mines, deadline_check)
+    except SearchTimeout:
+        pass
+    return safe, mines
+
+
+def _match_cells(frontier, cells, safe, mines, deadline_check):
+    """match_patterns over the given cells, adding the moves to safe and mines"""
+    rows, cols = frontier.rows, frontier.cols
+    status, shown, flagged_around = frontier.status, frontier.shown, frontier.flagged_around
+    hidden_status = frontier.HIDDEN
+    revealed_status = frontier.REVEALED
+
+    for i in cells:
+        if deadline_check is not None:
+            deadline_check()
+        remaining = shown[i] - flagged_around[i]
+        if status[i] != revealed_status or not shown[i] or remaining not in PATTERN_ANCHORS:
+            continue
+        row, col = divmod(i, cols)
+        mask = 0
+        for k, (dr, dc) in enumerate(DIRECTIONS):
+            r, c = row + dr, col + dc
+            if 0 <= r < rows and 0 <= c < cols and status[r * cols + c] == hidden_status:
+                mask |= 1 << k
+        for layout, table in PATTERN_TABLE.get((remaining, mask), ()):
+            signature = []
+            for dr, dc, is_number in layout:
+                r, c = row + dr, col + dc
+                if 0 <= r < rows and 0 <= c < cols:
+                    j = r * cols + c
+                    if is_number:
+                        value = shown[j] - flagged_around[j] if status[j] == revealed_status and shown[j] else -1
+                    else:
+                        value = int(status[j] == hidden_status)
+                else:
+                    value = -1 if is_number else 0
+                signature.append(value)
+
+            match = table.get(tuple(signature))
+            if match is None:
+                continue
+            deductions, maybe_safe = match
+            for dr, dc, move in deductions:
+                (safe if move == 'reveal' else mines).add((row + dr) * cols + col + dc)
+            for dr, dc in maybe_safe:
+                r, c = row + dr, col + dc
+                if 0 <= r < rows and 0 <= c < cols and status[r * cols + c] == hidden_status:
+                    safe.add(r * cols + c)
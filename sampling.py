@@ -0,0 +1,260 @@
+'''
+Module Name: sampling.py
+Purpose: Monte Carlo mine probabilities for frontier components too large to enumerate
+Input(s): None
+Output(s): None
+Original Author(s): Team 2
+Maintainer(s):  Jamie King
+                Jacob Kice
+                Gunther Luechtefeld
+                Joseph Hotze
+                Srihari Meyoor
+Outside Source(s):  None
+Updated Date: 10/17/2026
+'''
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from math import exp, log, sqrt
+from constants import CSP_MAX_COMPONENT_CELLS, MC_SAMPLES, MC_WORKERS, MC_CHUNK, MC_RETURN_MARGIN
+from csp_solver import frontier_constraints, split_components, expired
+
+# Worker processes, started on first use and kept for later estimates
+_executor = None
+
+
+class ComponentEstimate:
+    """
+    Sampled mine probabilities of one frontier component.
+    probabilities maps each cell to its estimate, intervals to a 95%
+    confidence interval (low, high), and effective_samples is the number of
+    equally weighted samples the weighted ones are worth.
+    """
+
+    __slots__ = ('cells', 'probabilities', 'intervals', 'effective_samples')
+
+    def __init__(self, cells, probabilities, intervals, effective_samples):
+        self.cells = cells
+        self.probabilities = probabilities
+        self.intervals = intervals
+        self.effective_samples = effective_samples
+
+
+def _sample_component(touching, members, need, left, samples, seed, deadline=None):
+    """
+    Draws mine assignments by sequential importance sampling: cells are set
+    in order, each to a value picked uniformly among those that survive
+    propagation (a constraint with no bombs left to place, or only bombs,
+    forces its other cells), and the sample is weighted by the product of
+    the number of choices so that all solutions count equally.
+    Returns (max_log_weight, sum_w, sum_w2, mine_w, mine_w2) with weights
+    scaled by exp(-max_log_weight); mine_w and mine_w2 sum w and w*w over
+    the samples with a mine in each cell. Stops early at the
+    time.perf_counter() deadline, dropping the sample in progress; that
+    clock is system-wide, so the deadline holds in worker processes too.
+    Runs in worker processes, so it only takes plain lists.
+    """
+    rng = random.Random(seed)
+    n = len(touching)
+    need = list(need)
+    left = list(left)
+    values = [-1] * n
+    trail = []
+
+    def propagate(k, value):
+        """Sets cell k and everything it forces; False on a contradiction"""
+        stack = [(k, value)]
+        while stack:
+            j, value = stack.pop()
+            if values[j] >= 0:
+                if values[j] != value:
+                    return False
+                continue
+            values[j] = value
+            trail.append(j)
+            for c in touching[j]:
+                left[c] -= 1
+                need[c] -= value
+            for c in touching[j]:
+                if need[c] < 0 or need[c] > left[c]:
+                    return False
+                if left[c] and (need[c] == 0 or need[c] == left[c]):
+                    forced = int(need[c] > 0)
+                    stack.extend((m, forced) for m in members[c] if values[m] < 0)
+        return True
+
+    def undo(mark):
+        while len(trail) > mark:
+            j = trail.pop()
+            for c in touching[j]:
+                left[c] += 1
+                need[c] += values[j]
+            values[j] = -1
+
+    drawn = []
+    for _ in range(samples):
+        if expired(deadline):
+            break
+        log_weight = 0.0
+        ok = True
+        for k in range(n):
+            if values[k] >= 0:
+                continue
+            if not k & 255 and expired(deadline):
+                ok = False
+                break
+            mark = len(trail)
+            choices = []
+            for value in (0, 1):
+                if propagate(k, value):
+                    choices.append(value)
+                undo(mark)
+            if not choices:
+                ok = False
+                break
+            if len(choices) == 2:
+                log_weight += log(2)
+            ok = propagate(k, choices[0] if len(choices) == 1 else int(rng.random() < 0.5))
+            if not ok:
+                break
+        if ok:
+            drawn.append((log_weight, [k for k in range(n) if values[k] == 1]))
+        undo(0)
+
+    mine_w = [0.0] * n
+    mine_w2 = [0.0] * n
+    if not drawn:
+        return 0.0, 0.0, 0.0, mine_w, mine_w2
+    max_log_weight = max(log_weight for log_weight, _ in drawn)
+    sum_w = sum_w2 = 0.0
+    for log_weight, mines in drawn:
+        w = exp(log_weight - max_log_weight)
+        sum_w += w
+        sum_w2 += w * w
+        for k in mines:
+            mine_w[k] += w
+            mine_w2[k] += w * w
+    return max_log_weight, sum_w, sum_w2, mine_w, mine_w2
+
+
+def _get_executor(workers):
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=workers)
+    return _executor
+
+
+def start_pool(workers=MC_WORKERS):
+    """
+    Starts the worker processes ahead of the first estimate, without
+    waiting for them, so no timed move pays for their start-up.
+    Does nothing when the samples would be drawn in this process.
+    """
+    global _executor
+    workers = max(1, min(workers, os.cpu_count() or 1))
+    if workers == 1:
+        return
+    try:
+        executor = _get_executor(workers)
+        for _ in range(workers):
+            executor.submit(int)
+    except (OSError, BrokenProcessPool):
+        _executor = None
+
+
+def _run_in_pool(jobs, workers, deadline):
+    """Runs the sampling jobs in the pool; returns the results of those done by the deadline"""
+    futures = [_get_executor(workers).submit(_sample_component, *job) for job in jobs]
+    timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+    done, not_done = wait(futures, timeout=timeout)
+    for future in not_done:
+        future.cancel()
+    return [future.result() for future in futures if future in done]
+
+
+def estimate_component(cells, constraints, samples=MC_SAMPLES, workers=MC_WORKERS, rng=random,
+                       deadline=None):
+    """
+    Estimates the mine probability of every cell of one component, all of
+    its solutions weighted equally (the global mine count is not used).
+    The samples are split over a process pool of up to `workers` processes
+    (no more than there are CPUs); with one, or if no pool can be started,
+    they are drawn in this process instead.
+    With a time.perf_counter() deadline they are drawn in chunks of MC_CHUNK,
+    the workers stop at the deadline and only the chunks finished in time
+    are used. start_pool() starts the workers before the first call.
+    Returns a ComponentEstimate (with no probabilities if nothing was drawn).
+    """
+    global _executor
+    position = {cell: k for k, cell in enumerate(cells)}
+    touching = [[] for _ in cells]
+    members = []
+    need = []
+    left = []
+    for c, (constraint_cells, mines) in enumerate(constraints):
+        members.append([position[cell] for cell in constraint_cells])
+        need.append(mines)
+        left.append(len(constraint_cells))
+        for cell in constraint_cells:
+            touching[position[cell]].append(c)
+
+    workers = max(1, min(workers, samples, os.cpu_count() or 1))
+    if deadline is None:
+        shares = [samples // workers + (w < samples % workers) for w in range(workers)]
+    else:
+        shares = [min(MC_CHUNK, samples - start) for start in range(0, samples, MC_CHUNK)]
+    # The workers stop a little early, so their partial chunks are back in time
+    stop = None if deadline is None else deadline - MC_RETURN_MARGIN * max(0.0, deadline - time.perf_counter())
+    jobs = [(touching, members, need, left, share, rng.getrandbits(64), stop) for share in shares]
+    results = None
+    if workers > 1:
+        try:
+            results = _run_in_pool(jobs, workers, deadline)
+        except (OSError, BrokenProcessPool):
+            _executor = None
+    if results is None:
+        results = []
+        for job in jobs:
+            if expired(deadline):
+                break
+            results.append(_sample_component(*job[:-1], deadline))
+    if not results:
+        return ComponentEstimate(cells, {}, {}, 0)
+
+    # Rescale every worker's weights to the largest one before adding up
+    top = max(result[0] for result in results)
+    sum_w = sum_w2 = 0.0
+    mine_w = [0.0] * len(cells)
+    mine_w2 = [0.0] * len(cells)
+    for max_log_weight, part_w, part_w2, part_mine_w, part_mine_w2 in results:
+        scale = exp(max_log_weight - top)
+        sum_w += part_w * scale
+        sum_w2 += part_w2 * scale * scale
+        for k in range(len(cells)):
+            mine_w[k] += part_mine_w[k] * scale
+            mine_w2[k] += part_mine_w2[k] * scale * scale
+
+    if not sum_w:
+        return ComponentEstimate(cells, {}, {}, 0)
+    probabilities = {}
+    intervals = {}
+    for k, cell in enumerate(cells):
+        p = mine_w[k] / sum_w
+        # Delta-method variance of the self-normalized estimate
+        variance = (mine_w2[k] * (1 - p) ** 2 + (sum_w2 - mine_w2[k]) * p * p) / (sum_w * sum_w)
+        margin = 1.96 * sqrt(max(0.0, variance))
+        probabilities[cell] = p
+        intervals[cell] = (max(0.0, p - margin), min(1.0, p + margin))
+    return ComponentEstimate(cells, probabilities, intervals, sum_w * sum_w / sum_w2)
+
+
+def estimate_frontier(frontier, samples=MC_SAMPLES, workers=MC_WORKERS, rng=random, deadline=None):
+    """
+    Samples every frontier component too large for the exact solver.
+    Returns a list of ComponentEstimates.
+    """
+    return [estimate_component(cells, constraints, samples, workers, rng, deadline)
+            for cells, constraints in split_components(frontier_constraints(frontier))
+            if len(cells) > CSP_MAX_COMPONENT_CELLS]
@@ -0,0 +1,35 @@
+'''
+Module Name: test_cell_pool.py
+Purpose: Checks the CellPool of hidden cells against a plain set
+Input(s): None
+Output(s): None
+Original Author(s): Team 2
+Maintainer(s):  Jamie King
+                Jacob Kice
+                Gunther Luechtefeld
+                Joseph Hotze
+                Srihari Meyoor
+Outside Source(s):  None
+Updated Date: 10/17/2026
+'''
+import random
+from cell_state import CellPool
+
+
+def test_pool_matches_set():
+    rng = random.Random(0)
+    size = 40
+    pool, expected = CellPool(size), set(range(size))
+    for _ in range(5000):
+        i = rng.randrange(size)
+        if rng.random() < 0.5:
+            pool.discard(i)
+            expected.discard(i)
+        else:
+            pool.add(i)
+            expected.add(i)
+        assert len(pool) == len(expected)
+        assert sorted(pool) == sorted(expected)
+        assert all((j in pool) == (j in expected) for j in range(size))
+        if expected:
+            assert pool.sample(rng) in expected
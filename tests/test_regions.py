@@ -0,0 +1,64 @@
+'''
+Module Name: test_regions.py
+Purpose: Checks the zero-region index against a plain flood fill
+Input(s): None
+Output(s): None
+Original Author(s): Team 2
+Maintainer(s):  Jamie King
+                Jacob Kice
+                Gunther Luechtefeld
+                Joseph Hotze
+                Srihari Meyoor
+Outside Source(s):  None
+Updated Date: 10/17/2026
+'''
+import random
+from grid import new_grid, generate_numbers, flood_fill, ensure_safe_start, ZeroRegionIndex, np
+
+
+def random_boards(count, seed=0):
+    """
+    Yields (grid, bombs) pairs: each random bomb layout on a plain grid and,
+    when numpy is installed, on an ArrayBoard.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        rows, cols = rng.randint(1, 16), rng.randint(1, 16)
+        density = rng.choice([0.0, 0.05, 0.1, 0.2, 0.4])
+        bombs = {(r, c) for r in range(rows) for c in range(cols) if rng.random() < density}
+        for array_backed in (False, True) if np is not None else (False,):
+            grid = new_grid(rows, cols, array_backed=array_backed)
+            for r, c in bombs:
+                grid[r][c] = -1
+            generate_numbers(grid)
+            yield grid, set(bombs)
+
+
+def assert_regions_match(grid, regions):
+    """Every zero cell's region equals the flood fill from it"""
+    for row in range(len(grid)):
+        for col in range(len(grid[0])):
+            if grid[row][col] == 0:
+                assert regions.region(row, col) == flood_fill(grid, row, col)
+
+
+def test_regions_match_flood_fill():
+    for grid, _ in random_boards(200, seed=1):
+        assert_regions_match(grid, ZeroRegionIndex(grid))
+
+
+def test_regions_follow_moved_bombs():
+    """A safe start that moves bombs invalidates the index, which then relabels"""
+    rng = random.Random(2)
+    for grid, bombs in random_boards(200, seed=3):
+        regions = ZeroRegionIndex(grid)
+        regions.rebuild()
+        row, col = rng.randrange(len(grid)), rng.randrange(len(grid[0]))
+        ensure_safe_start(grid, row, col, bombs, regions, rng)
+        # The bombs only all move when the cells outside the 3x3 hold them
+        rows, cols = len(grid), len(grid[0])
+        protected = ((min(row + 1, rows - 1) - max(row - 1, 0) + 1)
+                     * (min(col + 1, cols - 1) - max(col - 1, 0) + 1))
+        if len(bombs) <= rows * cols - protected:
+            assert grid[row][col] != -1
+        assert_regions_match(grid, regions)
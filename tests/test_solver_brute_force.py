@@ -0,0 +1,151 @@
+'''
+Module Name: test_solver_brute_force.py
+Purpose: Checks the AI solvers against brute-force enumeration on small boards
+Input(s): None
+Output(s): None
+Original Author(s): Team 2
+Maintainer(s):  Jamie King
+                Jacob Kice
+                Gunther Luechtefeld
+                Joseph Hotze
+                Srihari Meyoor
+Outside Source(s):  None
+Updated Date: 10/17/2026
+'''
+import random
+from itertools import product
+from grid import new_grid, generate_numbers, flood_fill, neighbor_table, neighbors
+from ai_solver import Frontier
+from patterns import match_patterns
+from csp_solver import solve_frontier, frontier_constraints, subset_deductions, gaussian_deductions
+
+# Positions with more hidden cells than this are skipped (2 ** n assignments)
+MAX_HIDDEN = 12
+
+
+def random_positions(count, seed=0):
+    """
+    Yields (grid, rows, cols, revealed, flagged, bombs) for small random
+    games in progress: a few safe cells opened with their flood fills, and
+    some of the bombs next to an opened number flagged (always correctly).
+    """
+    rng = random.Random(seed)
+    made = 0
+    while made < count:
+        rows, cols = rng.randint(3, 5), rng.randint(3, 6)
+        cells = [(r, c) for r in range(rows) for c in range(cols)]
+        bombs = set(rng.sample(cells, rng.randint(1, rows * cols // 3)))
+        grid = new_grid(rows, cols, array_backed=False)
+        for r, c in bombs:
+            grid[r][c] = -1
+        generate_numbers(grid)
+
+        safe = [cell for cell in cells if cell not in bombs]
+        revealed = set()
+        for r, c in rng.sample(safe, rng.randint(1, min(4, len(safe)))):
+            revealed.update(flood_fill(grid, r, c))
+        table = neighbor_table(rows, cols)
+        flagged = {(r, c) for r, c in bombs if rng.random() < 0.3
+                   and any(divmod(j, cols) in revealed for j in neighbors(table, r * cols + c))}
+
+        hidden = [cell for cell in cells if cell not in revealed and cell not in flagged]
+        if not hidden or len(hidden) > MAX_HIDDEN:
+            continue
+        made += 1
+        yield grid, rows, cols, revealed, flagged, bombs
+
+
+def consistent_assignments(grid, rows, cols, revealed, flagged, cells):
+    """
+    Yields every assignment {flat index: 0 or 1} of the given hidden cells
+    that agrees with each revealed number whose hidden neighbors are all
+    among them.
+    """
+    table = neighbor_table(rows, cols)
+    checks = []
+    for r, c in revealed:
+        around = [j for j in neighbors(table, r * cols + c)
+                  if divmod(j, cols) not in revealed and divmod(j, cols) not in flagged]
+        if around and all(j in cells for j in around):
+            flags = sum(1 for j in neighbors(table, r * cols + c) if divmod(j, cols) in flagged)
+            checks.append((around, grid[r][c] - flags))
+    for values in product((0, 1), repeat=len(cells)):
+        assignment = dict(zip(cells, values))
+        if all(sum(assignment[j] for j in around) == mines for around, mines in checks):
+            yield assignment
+
+
+def frontier_cells(frontier):
+    """Returns the hidden flat indices next to a frontier number, sorted"""
+    return sorted({j for i in frontier.cells for j in frontier.hidden_of(i)})
+
+
+def test_exact_solver_matches_enumeration():
+    """Without the mine count every frontier solution weighs the same"""
+    for grid, rows, cols, revealed, flagged, _ in random_positions(150, seed=1):
+        frontier = Frontier.from_board(grid, rows, cols, revealed, flagged)
+        cells = frontier_cells(frontier)
+        assignments = list(consistent_assignments(grid, rows, cols, revealed, flagged, cells))
+        safe, mines, probabilities, _, _ = solve_frontier(frontier)
+
+        assert set(probabilities) == set(cells)
+        for i in cells:
+            expected = sum(a[i] for a in assignments) / len(assignments)
+            assert abs(probabilities[i] - expected) < 1e-9
+        assert safe == {i for i in cells if all(a[i] == 0 for a in assignments)}
+        assert mines == {i for i in cells if all(a[i] == 1 for a in assignments)}
+
+
+def test_mine_count_matches_enumeration():
+    """With the mine count every full assignment of the hidden cells weighs the same"""
+    for grid, rows, cols, revealed, flagged, bombs in random_positions(150, seed=2):
+        frontier = Frontier.from_board(grid, rows, cols, revealed, flagged)
+        hidden = [r * cols + c for r in range(rows) for c in range(cols)
+                  if (r, c) not in revealed and (r, c) not in flagged]
+        mines_left = len(bombs) - len(flagged)
+        assignments = [a for a in consistent_assignments(grid, rows, cols, revealed, flagged, hidden)
+                       if sum(a.values()) == mines_left]
+        safe, mines, probabilities, interior_probability, _ = solve_frontier(frontier, None, mines_left)
+
+        cells = frontier_cells(frontier)
+        expected = {i: sum(a[i] for a in assignments) / len(assignments) for i in hidden}
+        assert set(probabilities) == set(cells)
+        for i in cells:
+            assert abs(probabilities[i] - expected[i]) < 1e-9
+        interior = [i for i in hidden if i not in probabilities]
+        if interior:
+            assert abs(interior_probability - expected[interior[0]]) < 1e-9
+        assert safe == {i for i in hidden if expected[i] == 0}
+        assert mines == {i for i in hidden if expected[i] == 1}
+
+
+def test_linear_deductions_are_sound():
+    """Subset and Gaussian deductions only report cells the enumeration proves"""
+    found = 0
+    for grid, rows, cols, revealed, flagged, _ in random_positions(150, seed=3):
+        frontier = Frontier.from_board(grid, rows, cols, revealed, flagged)
+        cells = frontier_cells(frontier)
+        assignments = list(consistent_assignments(grid, rows, cols, revealed, flagged, cells))
+        certain_safe = {i for i in cells if all(a[i] == 0 for a in assignments)}
+        certain_mines = {i for i in cells if all(a[i] == 1 for a in assignments)}
+
+        constraints = frontier_constraints(frontier)
+        for deduce in (subset_deductions, gaussian_deductions):
+            safe, mines = deduce(constraints)
+            assert safe <= certain_safe and mines <= certain_mines
+            found += len(safe) + len(mines)
+    assert found
+
+
+def test_pattern_table_is_sound():
+    """Every pattern match is a move the enumeration proves"""
+    found = 0
+    for grid, rows, cols, revealed, flagged, _ in random_positions(300, seed=4):
+        frontier = Frontier.from_board(grid, rows, cols, revealed, flagged)
+        cells = frontier_cells(frontier)
+        assignments = list(consistent_assignments(grid, rows, cols, revealed, flagged, cells))
+        safe, mines = match_patterns(frontier)
+        assert all(a[i] == 0 for i in safe for a in assignments)
+        assert all(a[i] == 1 for i in mines for a in assignments)
+        found += len(safe) + len(mines)
+    assert found
@@ -10,19 +10,151 @@ Maintainer(s):  Jamie King
                 Joseph Hotze
                 Srihari Meyoor
 Outside Source(s):  None
-Updated Date: 10/05/2025
+Updated Date: 10/17/2026
 '''
 import pygame
 from constants import *
+from grid import ArrayBoard, np
+
+if np is not None:
+    import pygame.surfarray
+
+# Tile index of each tile key in the atlas: revealed numbers 0-8 are their
+# own index
+TILE_KEYS = tuple(range(9)) + ('hidden', 'flag', 'bomb')
+TILE_HIDDEN, TILE_FLAG, TILE_BOMB = 9, 10, 11
+
+
+class UIAssets:
+    """
+    Fonts, rendered text and cell tiles for one cell size, built on first
+    use and then reused, so steady frames construct no fonts and rasterize
+    no text. Get the shared instance through get_assets().
+    Tiles are keyed 'hidden', 'flag', 'bomb' or by the revealed number 0-8.
+    With numpy the tiles are also stacked into one pixel array, the atlas,
+    for compositing many cells at once.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.fonts = {}
+        self.texts = {}
+        self.labels = {}
+        self.tiles = {}
+        self.overlays = {}
+        self.atlas_pixels = None
+
+    def font(self, size):
+        font = self.fonts.get(size)
+        if font is None:
+            font = self.fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    def text(self, size, text, color):
+        """Rendered fixed text (titles, button captions, numbers)"""
+        key = (size, text, color)
+        surface = self.texts.get(key)
+        if surface is None:
+            surface = self.texts[key] = self.font(size).render(text, True, color)
+        return surface
+
+    def label(self, slot, size, text, color):
+        """Rendered changing text: only the latest text of each slot is kept"""
+        cached = self.labels.get(slot)
+        if cached is None or cached[0] != (size, text, color):
+            cached = self.labels[slot] = ((size, text, color), self.font(size).render(text, True, color))
+        return cached[1]
+
+    def overlay(self, width, height):
+        """Semi-transparent black sheet for the game over popup"""
+        overlay = self.overlays.get((width, height))
+        if overlay is None:
+            overlay = self.overlays[(width, height)] = pygame.Surface((width, height))
+            overlay.set_alpha(128)
+            overlay.fill(COLOR_BLACK)
+        return overlay
+
+    def tile(self, key):
+        tile = self.tiles.get(key)
+        if tile is None:
+            tile = self.tiles[key] = self._draw_tile(key)
+        return tile
+
+    def atlas(self):
+        """
+        Returns the tiles' pixels as one array indexed [tile index, x, y], in
+        TILE_KEYS order (requires numpy). Pixels are mapped color values in
+        the format of the tiles, which is that of any plain pygame.Surface.
+        """
+        if self.atlas_pixels is None:
+            self.atlas_pixels = np.stack([pygame.surfarray.array2d(self.tile(key)) for key in TILE_KEYS])
+        return self.atlas_pixels
+
+    def _draw_tile(self, key):
+        cell_size = self.cell_size
+        tile = pygame.Surface((cell_size, cell_size))
+        rect = tile.get_rect()
+        
+        if key == 'bomb':
+            # Bomb cell
+            pygame.draw.rect(tile, COLOR_BOMB_RED, rect)
+            pygame.draw.circle(tile, COLOR_BLACK, rect.center, cell_size // 4)
+        elif key in ('hidden', 'flag'):
+            # Unrevealed cells
+            pygame.draw.rect(tile, COLOR_GRAY, rect)
+            
+            # Draw flag if cell is flagged
+            if key == 'flag':
+                flag_size = cell_size // 3
+                flag_x = rect.centerx - flag_size // 2
+                flag_y = rect.centery - flag_size // 2
+                
+                # Flag pole
+                pygame.draw.line(tile, COLOR_BROWN, 
+                               (flag_x, flag_y), 
+                               (flag_x, flag_y + flag_size), 3)
+                
+                # Flag triangle
+                flag_points = [
+                    (flag_x, flag_y),
+                    (flag_x + flag_size, flag_y + flag_size // 3),
+                    (flag_x, flag_y + 2 * flag_size // 3)
+                ]
+                pygame.draw.polygon(tile, COLOR_RED, flag_points)
+        else:
+            # Safe cell revealed
+            pygame.draw.rect(tile, COLOR_LIGHT_GRAY, rect)
+            if key > 0:
+                color = NUMBER_COLORS.get(key, COLOR_BLACK)
+                text_surface = self.text(cell_size // 2, str(key), color)
+                tile.blit(text_surface, text_surface.get_rect(center=rect.center))
+        
+        # Cell border
+        pygame.draw.rect(tile, COLOR_BLACK, rect, 1)
+        return tile
+
+
+# Assets for the current cell size
+_assets = None
+
+
+def get_assets(cell_size=None):
+    """
+    Returns the shared UIAssets, rebuilt only when a different cell_size is
+    asked for (None keeps the current ones).
+    """
+    global _assets
+    if _assets is None or (cell_size is not None and cell_size != _assets.cell_size):
+        _assets = UIAssets(cell_size)
+    return _assets
 
 
 def draw_game_over_popup(screen, width, height, ai_mode, players_turn, game_won=False):
     """Draw a game over popup with play again and quit buttons"""
+    assets = get_assets()
+    
     # Semi-transparent overlay
-    overlay = pygame.Surface((width, height))
-    overlay.set_alpha(128)
-    overlay.fill(COLOR_BLACK)
-    screen.blit(overlay, (0, 0))
+    screen.blit(assets.overlay(width, height), (0, 0))
     
     # Popup background
     popup_width = 300
@@ -35,7 +167,6 @@ def draw_game_over_popup(screen, width, height, ai_mode, players_turn, game_won=
     pygame.draw.rect(screen, COLOR_BLACK, popup_rect, 3)
     
     # Title
-    title_font = pygame.font.Font(None, 36)
     if ai_mode == 'interactive':
         if game_won:
             title_text = 'You Won!' if not players_turn else 'Computer Won!'
@@ -47,18 +178,15 @@ def draw_game_over_popup(screen, width, height, ai_mode, players_turn, game_won=
         title_text = "You Won!" if game_won else "Game Over!"
     
     title_color = COLOR_DARK_GREEN if game_won else COLOR_RED
-    title_surface = title_font.render(title_text, True, title_color)
+    title_surface = assets.text(36, title_text, title_color)
     title_rect = title_surface.get_rect(center=(popup_x + popup_width // 2, popup_y + 50))
     screen.blit(title_surface, title_rect)
     
-    # Buttons
-    button_font = pygame.font.Font(None, 24)
-    
     # Play Again button
     play_again_rect = pygame.Rect(popup_x + 20, popup_y + 100, 100, 40)
     pygame.draw.rect(screen, COLOR_GREEN, play_again_rect)
     pygame.draw.rect(screen, COLOR_BLACK, play_again_rect, 2)
-    play_again_text = button_font.render("Play Again", True, COLOR_WHITE)
+    play_again_text = assets.text(24, "Play Again", COLOR_WHITE)
     play_again_text_rect = play_again_text.get_rect(center=play_again_rect.center)
     screen.blit(play_again_text, play_again_text_rect)
     
@@ -66,82 +194,172 @@ def draw_game_over_popup(screen, width, height, ai_mode, players_turn, game_won=
     quit_rect = pygame.Rect(popup_x + 180, popup_y + 100, 100, 40)
     pygame.draw.rect(screen, COLOR_DARK_RED, quit_rect)
     pygame.draw.rect(screen, COLOR_BLACK, quit_rect, 2)
-    quit_text = button_font.render("Quit", True, COLOR_WHITE)
+    quit_text = assets.text(24, "Quit", COLOR_WHITE)
     quit_text_rect = quit_text.get_rect(center=quit_rect.center)
     screen.blit(quit_text, quit_text_rect)
     
     return play_again_rect, quit_rect
 
 
-def draw_board(screen, grid, board_rows, board_cols, cell_size, revealed, flagged, font):
-    """Draw the minesweeper board"""
+def draw_cell(screen, grid, row, col, x, y, revealed, flagged, assets):
+    """Draw one board cell with its top-left corner at (x, y)"""
+    if (row, col) in revealed:
+        key = 'bomb' if grid[row][col] == -1 else int(grid[row][col])
+    else:
+        key = 'flag' if (row, col) in flagged else 'hidden'
+    screen.blit(assets.tile(key), (x, y))
+
+
+def tile_indices(grid, revealed, flagged, rows, cols):
+    """
+    Returns the atlas tile index of each cell in the given row and column
+    slices, as a uint8 array indexed [row, col] (requires numpy).
+    revealed and flagged are the board's CellSets.
+    """
+    if isinstance(grid, ArrayBoard):
+        values = grid.cells[rows, cols]
+    else:
+        values = np.array([line[cols] for line in grid[rows]], dtype=np.int8)
+    width = len(grid[0])
+    shown = np.frombuffer(revealed.data, dtype=np.uint8).reshape(-1, width)[rows, cols]
+    flags = np.frombuffer(flagged.data, dtype=np.uint8).reshape(-1, width)[rows, cols]
+    return np.where(shown, np.where(values == -1, TILE_BOMB, values),
+                    np.where(flags, TILE_FLAG, TILE_HIDDEN)).astype(np.uint8)
+
+
+def draw_board(screen, grid, board_rows, board_cols, cell_size, revealed, flagged, assets=None, top=UI_HEIGHT):
+    """Draw the minesweeper board, its top edge at y = top"""
+    if assets is None:
+        assets = get_assets(cell_size)
     for row in range(board_rows):
         for col in range(board_cols):
-            x = col * cell_size
-            y = row * cell_size + UI_HEIGHT
-            rect = pygame.Rect(x, y, cell_size, cell_size)
-            
-            if (row, col) in revealed:
-                if grid[row][col] == -1:
-                    # Bomb cell
-                    pygame.draw.rect(screen, COLOR_BOMB_RED, rect)
-                    center = rect.center
-                    pygame.draw.circle(screen, COLOR_BLACK, center, cell_size // 4)
-                else:
-                    # Safe cell revealed
-                    pygame.draw.rect(screen, COLOR_LIGHT_GRAY, rect)
-                    number = grid[row][col]
-                    if number > 0:
-                        color = NUMBER_COLORS.get(number, COLOR_BLACK)
-                        text_surface = font.render(str(number), True, color)
-                        text_rect = text_surface.get_rect(center=rect.center)
-                        screen.blit(text_surface, text_rect)
-            else:
-                # Unrevealed cells
-                pygame.draw.rect(screen, COLOR_GRAY, rect)
-                
-                # Draw flag if cell is flagged
-                if (row, col) in flagged:
-                    flag_size = cell_size // 3
-                    flag_x = rect.centerx - flag_size // 2
-                    flag_y = rect.centery - flag_size // 2
-                    
-                    # Flag pole
-                    pygame.draw.line(screen, COLOR_BROWN, 
-                                   (flag_x, flag_y), 
-                                   (flag_x, flag_y + flag_size), 3)
-                    
-                    # Flag triangle
-                    flag_points = [
-                        (flag_x, flag_y),
-                        (flag_x + flag_size, flag_y + flag_size // 3),
-                        (flag_x, flag_y + 2 * flag_size // 3)
-                    ]
-                    pygame.draw.polygon(screen, COLOR_RED, flag_points)
-            
-            # Cell border
-            pygame.draw.rect(screen, COLOR_BLACK, rect, 1)
+            draw_cell(screen, grid, row, col, col * cell_size, row * cell_size + top,
+                      revealed, flagged, assets)
+
+
+class BoardRenderer:
+    """
+    Retained-mode board drawing through a Viewport: the shown part of the
+    board lives on an off-screen surface the size of the view, and only the
+    visible cells a GameState reports as changed are redrawn on it. Panning
+    or zooming redraws the visible cells only, so the cost follows the
+    window size, not the board size.
+    With numpy a whole redraw is composited in one go from the tile atlas
+    instead of blitting cell by cell, and so is a move that changes more
+    than BULK_REDRAW_MIN_CELLS cells (a large flood fill).
+    update() returns the screen rectangles that changed, for
+    pygame.display.update(rects); nothing is drawn when nothing changed.
+    """
+
+    def __init__(self, viewport):
+        self.viewport = viewport
+        self.surface = pygame.Surface((viewport.width, viewport.height))
+        self.assets = None
+        self.state = None
+        self.view = None
+
+    def update(self, screen, state):
+        """Redraws the changed cells, copies them to the screen and returns their rects"""
+        changes = state.take_changes()
+        viewport = self.viewport
+        if (state is not self.state or changes is None or viewport.view() != self.view
+                or (np is not None and len(changes) > BULK_REDRAW_MIN_CELLS)):
+            self.state = state
+            self.redraw()
+            return [self.blit_all(screen)]
+        
+        size = viewport.cell_size
+        first_row, end_row, first_col, end_col = viewport.visible_range()
+        bounds = self.surface.get_rect()
+        rects = []
+        for i in changes:
+            row, col = divmod(i, state.cols)
+            if not (first_row <= row < end_row and first_col <= col < end_col):
+                continue
+            x, y = viewport.cell_origin(row, col)
+            draw_cell(self.surface, state.grid, row, col, x, y, state.revealed, state.flagged, self.assets)
+            area = pygame.Rect(x, y, size, size).clip(bounds)
+            rects.append(screen.blit(self.surface, (area.x, area.y + viewport.top), area))
+        return rects
+
+    def redraw(self):
+        """Draws every visible cell on the off-screen surface"""
+        state = self.state
+        viewport = self.viewport
+        self.view = viewport.view()
+        self.assets = get_assets(viewport.cell_size)
+        # Past the board's edges when it is smaller than the view
+        self.surface.fill(COLOR_WHITE)
+        first_row, end_row, first_col, end_col = viewport.visible_range()
+        if np is not None:
+            self._composite(first_row, end_row, first_col, end_col)
+            return
+        for row in range(first_row, end_row):
+            for col in range(first_col, end_col):
+                x, y = viewport.cell_origin(row, col)
+                draw_cell(self.surface, state.grid, row, col, x, y, state.revealed, state.flagged, self.assets)
+
+    def _composite(self, first_row, end_row, first_col, end_col):
+        """Builds the visible cells' pixels from the atlas and copies them to the surface at once"""
+        state = self.state
+        viewport = self.viewport
+        size = viewport.cell_size
+        indices = tile_indices(state.grid, state.revealed, state.flagged,
+                               slice(first_row, end_row), slice(first_col, end_col))
+        # Tiles indexed [col, row, x, y] are reordered to [col, x, row, y],
+        # which flattens to the pixels of the cells in surfarray's [x, y] order
+        pixels = self.assets.atlas()[indices.T].transpose(0, 2, 1, 3).reshape(
+            (end_col - first_col) * size, (end_row - first_row) * size)
+        # Cut away what the partly shown cells at the edges hang over
+        x = viewport.x - first_col * size
+        y = viewport.y - first_row * size
+        pixels = pixels[x:x + viewport.width, y:y + viewport.height]
+        if pixels.size:
+            pygame.surfarray.blit_array(self.surface.subsurface((0, 0), pixels.shape), pixels)
 
+    def blit_all(self, screen):
+        """Copies the whole view to the screen and returns its rect"""
+        return screen.blit(self.surface, (0, self.viewport.top))
 
-def draw_ui(screen, elapsed_time, num_bombs, num_flagged, game_started, game_over):
-    """Draw the UI elements (title, timer, bomb count)"""
+
+def draw_ui(screen, elapsed_time, num_bombs, num_flagged, game_started, game_over, ai_status=None):
+    """Draw the UI elements (title, timer, bomb count, AI status)"""
+    assets = get_assets()
+    
     # Title
-    title_font = pygame.font.Font(None, 48)
-    title_surface = title_font.render("MINESWEEPER", True, COLOR_BLACK)
+    title_surface = assets.text(48, "MINESWEEPER", COLOR_BLACK)
     title_rect = title_surface.get_rect(center=(BOARD_WIDTH // 2, 30))
     screen.blit(title_surface, title_rect)
     
     # Timer
     if game_started and not game_over:
-        timer_font = pygame.font.Font(None, 24)
-        timer_surface = timer_font.render(f"Time: {elapsed_time}s", True, COLOR_BLACK)
+        timer_surface = assets.label('timer', 24, f"Time: {elapsed_time}s", COLOR_BLACK)
         screen.blit(timer_surface, (10, 60))
     
     # Bomb count
-    bomb_font = pygame.font.Font(None, 24)
     remaining_bombs = num_bombs - num_flagged
-    bomb_surface = bomb_font.render(f"Bombs: {remaining_bombs}", True, COLOR_BLACK)
+    bomb_surface = assets.label('bombs', 24, f"Bombs: {remaining_bombs}", COLOR_BLACK)
     screen.blit(bomb_surface, (BOARD_WIDTH - 100, 60))
+    
+    # AI speed / pause status
+    if ai_status:
+        status_surface = assets.text(24, ai_status, COLOR_BLACK)
+        status_rect = status_surface.get_rect(midtop=(BOARD_WIDTH // 2, 60))
+        screen.blit(status_surface, status_rect)
+
+def next_events(timeout=None):
+    """
+    Returns the queued events. If there are none, first sleeps until one
+    arrives, for at most timeout ms (None: no limit, 0: no sleeping).
+    """
+    events = pygame.event.get()
+    if events or timeout == 0:
+        return events
+    event = pygame.event.wait() if timeout is None else pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event] + pygame.event.get()
+
 
 def options(screen):
     "Code for game settings page: Grid Size, Number of Bombs, AI mode and Difficulty"
@@ -174,35 +392,21 @@ def options(screen):
 
     #AI difficulty levels
     ai_difficulty_opts = {
-        "easy" : pygame.Rect(50, 370, 80, 40),
-        "medium": pygame.Rect(170, 370, 100, 40),
-        "hard" : pygame.Rect(310, 370, 80, 40) 
+        "easy" : pygame.Rect(30, 370, 80, 40),
+        "medium": pygame.Rect(120, 370, 100, 40),
+        "hard" : pygame.Rect(230, 370, 80, 40),
+        "expert": pygame.Rect(320, 370, 100, 40)
     }
 
     #Start button
     start = pygame.Rect(150, 440, 200, 50)
-    while choosing:
-        screen.fill((0,0,0))
-
-        labels = [("Rows", "row_selection", 105), ("Cols", "col_selection", 160), ("Bombs", "bomb_count", 210)]
-        
-        #insert grid size buttons onto screen
-        for i, (label, key, y) in enumerate(labels):
-            curr_label = font.render(label, True, (255,255,255))
-            screen.blit(curr_label, (100, y))
-
-            color = (0,200,0)
-            pygame.draw.rect(screen, color, userbox[key], 2)
-
-            typed_txt = font.render(values[key], True, (255,255,255))
-            screen.blit(typed_txt, (userbox[key].x+5, userbox[key].y+5))
-        
-        pygame.draw.rect(screen, (0,200,0), start)
-        start_text = font.render("Start Game", True, (255,255,255))
-        screen.blit(start_text, (start.x+30, start.y+10))
 
+    # Nothing animates here: the screen is redrawn only after input
+    clock = pygame.time.Clock()
+    timeout = 0
+    while choosing:
         #Event Handling
-        for event in pygame.event.get():
+        for event in next_events(timeout):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 exit()
@@ -241,6 +445,25 @@ def options(screen):
                 elif event.unicode.isdigit():
                     values[curr_box] += event.unicode
 
+        screen.fill((0,0,0))
+
+        labels = [("Rows", "row_selection", 105), ("Cols", "col_selection", 160), ("Bombs", "bomb_count", 210)]
+        
+        #insert grid size buttons onto screen
+        for i, (label, key, y) in enumerate(labels):
+            curr_label = font.render(label, True, (255,255,255))
+            screen.blit(curr_label, (100, y))
+
+            color = (0,200,0)
+            pygame.draw.rect(screen, color, userbox[key], 2)
+
+            typed_txt = font.render(values[key], True, (255,255,255))
+            screen.blit(typed_txt, (userbox[key].x+5, userbox[key].y+5))
+        
+        pygame.draw.rect(screen, (0,200,0), start)
+        start_text = font.render("Start Game", True, (255,255,255))
+        screen.blit(start_text, (start.x+30, start.y+10))
+
         #draw ai buttons based on ai toggle switch
         pygame.draw.rect(screen, (0, 200, 0) if ai_on else (200, 0, 0), ai_toggle)
         toggle_text = font.render("AI: ON" if ai_on else "AI: OFF", True, (255, 255, 255))
@@ -260,5 +483,7 @@ def options(screen):
                 screen.blit(text, (val.x + 10, val.y + 10))
 
         pygame.display.flip()
+        clock.tick(FPS_CAP)
+        timeout = None
 
     return rows, cols, bombs, ai_mode, ai_difficulty
\ No newline at end of file
@@ -0,0 +1,95 @@
+'''
+Module Name: viewport.py
+Purpose: Scrollable, zoomable view of the board
+Input(s): None
+Output(s): None
+Original Author(s): Team 2
+Maintainer(s):  Jamie King
+                Jacob Kice
+                Gunther Luechtefeld
+                Joseph Hotze
+                Srihari Meyoor
+Outside Source(s):  None
+Updated Date: 10/17/2026
+'''
+from constants import MIN_CELL_SIZE, MAX_CELL_SIZE, ZOOM_FACTOR
+
+
+class Viewport:
+    """
+    Camera over the board: the part of it shown in a width x height area of
+    the window whose top edge is at y = top, at a given cell size.
+    Cell (row, col) covers board pixels from (col * cell_size, row * cell_size);
+    (x, y) is the board pixel at the area's top-left corner.
+    Cell sizes are kept within MIN_CELL_SIZE and MAX_CELL_SIZE (or the
+    starting size, if larger), and the view never scrolls past the board's
+    edges.
+    """
+
+    def __init__(self, board_rows, board_cols, width, height, top=0, cell_size=MIN_CELL_SIZE):
+        self.rows = board_rows
+        self.cols = board_cols
+        self.width = width
+        self.height = height
+        self.top = top
+        self.max_cell_size = max(MAX_CELL_SIZE, cell_size)
+        self.cell_size = max(MIN_CELL_SIZE, cell_size)
+        self.x = 0
+        self.y = 0
+
+    def view(self):
+        """What is shown: (cell_size, x, y)"""
+        return self.cell_size, self.x, self.y
+
+    def _clamp(self):
+        self.x = min(max(0, self.x), max(0, self.cols * self.cell_size - self.width))
+        self.y = min(max(0, self.y), max(0, self.rows * self.cell_size - self.height))
+
+    def pan(self, dx, dy):
+        """Scrolls the view by (dx, dy) pixels"""
+        self.x += dx
+        self.y += dy
+        self._clamp()
+
+    def zoom(self, steps, anchor=None):
+        """
+        Zooms in (steps > 0) or out by ZOOM_FACTOR per step, keeping the
+        board point under anchor (window coordinates, default: the area's
+        center) in place.
+        """
+        old = self.cell_size
+        new = round(old * ZOOM_FACTOR ** steps)
+        if new == old and steps:
+            new = old + (1 if steps > 0 else -1)
+        new = min(self.max_cell_size, max(MIN_CELL_SIZE, new))
+        if new == old:
+            return
+        if anchor is None:
+            ax, ay = self.width // 2, self.height // 2
+        else:
+            ax, ay = anchor[0], anchor[1] - self.top
+        self.x = (self.x + ax) * new // old - ax
+        self.y = (self.y + ay) * new // old - ay
+        self.cell_size = new
+        self._clamp()
+
+    def cell_at(self, mx, my):
+        """Returns the (row, col) under window position (mx, my), or None"""
+        ax, ay = mx, my - self.top
+        if not (0 <= ax < self.width and 0 <= ay < self.height):
+            return None
+        row = (self.y + ay) // self.cell_size
+        col = (self.x + ax) // self.cell_size
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    def visible_range(self):
+        """Returns (first_row, end_row, first_col, end_col) of the cells at least partly shown"""
+        size = self.cell_size
+        return (self.y // size, min(self.rows, -(-(self.y + self.height) // size)),
+                self.x // size, min(self.cols, -(-(self.x + self.width) // size)))
+
+    def cell_origin(self, row, col):
+        """Top-left corner of a cell, relative to the area"""
+        return col * self.cell_size - self.x, row * self.cell_size - self.y